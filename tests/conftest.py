@@ -0,0 +1,104 @@
+import threading
+import uuid
+from typing import Any, List, Optional
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from tradingagents.dataflows.config import use_config
+from tradingagents.default_config import DEFAULT_CONFIG
+
+DECISION = "FINAL TRANSACTION PROPOSAL: **BUY**"
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering without an API.
+
+    Bound to tools, it first calls ``tool_call`` (a name and args) if given,
+    and, with ``when_bound``, only if that tool is bound; then it reports the
+    tool's result; without a tool call it reports the names
+    of the bound tools. Otherwise it answers with DECISION. The messages of
+    every call are appended to ``prompts`` if given, and every answer
+    reports ``tokens`` tokens of usage.
+    """
+
+    tool_call: Optional[dict] = None
+    when_bound: Optional[str] = None
+    bound_tools: List[str] = []
+    prompts: Any = None  # a list, kept as given
+    tokens: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.model_copy(update={"bound_tools": [tool.name for tool in tools]})
+
+    def _generate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        if self.prompts is not None:
+            self.prompts.append((self.bound_tools, messages))
+        last = messages[-1]
+        if isinstance(last, ToolMessage):
+            message = AIMessage(content=f"Report: {last.content}")
+        elif self.tool_call and self.bound_tools and (
+            self.when_bound is None or self.when_bound in self.bound_tools
+        ):
+            message = AIMessage(
+                content="",
+                tool_calls=[{**self.tool_call, "id": f"call-{uuid.uuid4().hex}"}],
+            )
+        elif self.bound_tools:
+            message = AIMessage(content=f"Report: {', '.join(self.bound_tools)}")
+        else:
+            message = AIMessage(content=DECISION)
+        if self.tokens:
+            message.usage_metadata = {
+                "input_tokens": self.tokens,
+                "output_tokens": 0,
+                "total_tokens": self.tokens,
+            }
+            message.response_metadata = {"model_name": "fake"}
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class FakeMemory:
+    def __init__(self, *args):
+        self.situations = []
+        self._lock = threading.Lock()
+
+    def get_memories(self, current_situation, n_matches=1):
+        return []
+
+    def add_situations(self, situations_and_advice):
+        with self._lock:
+            self.situations.extend(situations_and_advice)
+
+
+@pytest.fixture
+def fake_graph(monkeypatch, tmp_path):
+    """Factory of TradingAgentsGraphs whose LLMs and memories are fakes.
+
+    Every graph's models are built by ``llm`` (a FakeChatModel by default);
+    state logs are written under tmp_path.
+    """
+    import tradingagents.graph.trading_graph as trading_graph
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(trading_graph, "FinancialSituationMemory", FakeMemory)
+
+    def make(config=None, llm=None, **kwargs):
+        llm = llm or FakeChatModel()
+        monkeypatch.setattr(trading_graph, "ChatOpenAI", lambda **_: llm)
+        return trading_graph.TradingAgentsGraph(
+            config={**DEFAULT_CONFIG, "tool_process_workers": 0, **(config or {})},
+            **kwargs,
+        )
+
+    # the graphs' process-wide settings are confined to the test
+    with use_config({}):
+        yield make
@@ -0,0 +1,50 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from tradingagents.agents.utils.agent_utils import truncate_tool_results
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+def conversation(results):
+    messages = [HumanMessage(content="AAPL")]
+    for i, content in enumerate(results):
+        messages.append(
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "get_YFin_data", "args": {}, "id": f"call-{i}"}],
+            )
+        )
+        messages.append(
+            ToolMessage(content=content, name="get_YFin_data", tool_call_id=f"call-{i}")
+        )
+    return messages
+
+
+def test_older_tool_results_are_truncated():
+    results = [str(i) * 100 for i in range(4)]
+    config = {"context_keep_tool_results": 2, "context_truncate_chars": 10}
+
+    truncated = truncate_tool_results(conversation(results), config)
+
+    tool_messages = [m for m in truncated if isinstance(m, ToolMessage)]
+    assert len(truncated) == len(conversation(results))
+    assert [m.tool_call_id for m in tool_messages] == [f"call-{i}" for i in range(4)]
+    for message, content in zip(tool_messages[:2], results[:2]):
+        assert message.content == (
+            content[:10]
+            + "\n... [90 more characters of this earlier get_YFin_data result omitted]"
+        )
+    assert [m.content for m in tool_messages[2:]] == results[2:]
+
+
+def test_short_tool_results_are_kept():
+    messages = conversation(["short", "x" * 100])
+    config = {"context_keep_tool_results": 1, "context_truncate_chars": 10}
+
+    assert truncate_tool_results(messages, config)[2].content == "short"
+
+
+def test_messages_are_unchanged_by_default():
+    messages = conversation(["x" * 10_000 for _ in range(5)])
+
+    assert DEFAULT_CONFIG["context_keep_tool_results"] == 0
+    assert truncate_tool_results(messages, DEFAULT_CONFIG) is messages
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.batch_runner import BatchJob, BatchRunner
+from tradingagents.graph.trading_graph import get_llm_rate_limiter
+
+from conftest import FakeChatModel
+
+
+class FakeGraph:
+    """Graph whose analyses make one LLM call, failing ``failures[ticker]`` times."""
+
+    def __init__(self, failures=None, tokens=None, **config):
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.failures = dict(failures or {})
+        self.tokens = tokens or {}
+        self.running = 0
+        self.peak = 0
+
+    async def apropagate(self, ticker, trade_date):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(0.01)
+            llm = FakeChatModel(tokens=self.tokens.get(ticker, 0))
+            response = await llm.ainvoke(ticker)
+            if self.failures.get(ticker, 0):
+                self.failures[ticker] -= 1
+                raise RuntimeError(f"{ticker} failed")
+            return {"company_of_interest": ticker}, response.content
+        finally:
+            self.running -= 1
+
+
+def run(graph, tickers, **kwargs):
+    runner = BatchRunner(graph, retry_backoff=0, **kwargs)
+    return {
+        result.ticker: result
+        for result in runner.run([BatchJob(ticker, "2024-05-10") for ticker in tickers])
+    }
+
+
+def test_failed_jobs_are_retried():
+    graph = FakeGraph(failures={"FLAKY": 1, "BAD": 99})
+
+    results = run(graph, ["OK", "FLAKY", "BAD"], max_retries=2)
+
+    assert [results[t].attempts for t in ("OK", "FLAKY", "BAD")] == [1, 2, 3]
+    assert results["FLAKY"].error is None and results["FLAKY"].decision
+    assert isinstance(results["BAD"].error, RuntimeError)
+    assert results["BAD"].decision is None and results["BAD"].final_state is None
+
+
+def test_concurrency_is_bounded():
+    graph = FakeGraph()
+
+    results = run(graph, [f"T{i}" for i in range(8)], max_concurrency=3)
+
+    assert len(results) == 8
+    assert graph.peak == 3
+
+
+def test_tokens_are_attributed_to_their_job():
+    tokens = {f"T{i}": 100 * (i + 1) for i in range(6)}
+    graph = FakeGraph(failures={"T2": 1}, tokens=tokens)
+
+    results = run(graph, tokens, max_concurrency=6)
+
+    # a retried job is charged for every attempt
+    assert {t: r.tokens for t, r in results.items()} == {
+        t: n * (2 if t == "T2" else 1) for t, n in tokens.items()
+    }
+
+
+def test_tokens_per_minute_delay_admissions():
+    # the first job takes the whole burst, the next one waits for 50 tokens
+    graph = FakeGraph(
+        tokens={"A": 50, "B": 50},
+        llm_rate_limits={"openai": {"tokens_per_minute": 6000}},
+        batch_tokens_per_job=6000,
+    )
+
+    results = run(graph, ["A", "B"], max_concurrency=1)
+
+    assert results["A"].seconds < 0.3
+    assert results["B"].seconds == pytest.approx(0.5, abs=0.2)
+
+
+def test_request_limiters_are_shared_per_provider():
+    config = {"llm_rate_limits": {"openai": {"requests_per_minute": 60}}}
+
+    limiter = get_llm_rate_limiter("openai", config)
+
+    assert limiter is get_llm_rate_limiter("openai", dict(config))
+    assert get_llm_rate_limiter("anthropic", config) is None
+    faster = {"llm_rate_limits": {"openai": {"requests_per_minute": 120}}}
+    assert get_llm_rate_limiter("openai", faster) is not limiter
@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.price_store import get_price_store, offline_price_path
+
+from conftest import FakeChatModel
+
+INDICATOR_CALL = {
+    "name": "get_stockstats_indicators_report",
+    "args": {
+        "symbol": "AAA",
+        "indicator": "close_50_sma",
+        "curr_date": "2024-05-10",
+        "look_back_days": 3,
+    },
+}
+
+
+def write_prices(price_dir, close):
+    price_dir.mkdir(parents=True)
+    dates = pd.bdate_range("2024-01-01", "2024-06-28")
+    close = np.full(len(dates), close)
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close,
+            "High": close,
+            "Low": close,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": 1e6,
+        }
+    ).to_csv(offline_price_path("AAA", str(price_dir)), index=False)
+
+
+@pytest.fixture
+def graphs(fake_graph, tmp_path):
+    """Two offline graphs on their own data_dir and an online graph.
+
+    The market analysts of the offline graphs call the indicator tool, which
+    runs in each graph's spawned tool process.
+    """
+    get_price_store().clear()
+    made = {}
+    for name, close in (("a", 111.0), ("b", 222.0)):
+        write_prices(tmp_path / name / "market_data" / "price_data", close)
+        made[name] = fake_graph(
+            {
+                "data_dir": str(tmp_path / name),
+                "data_cache_dir": str(tmp_path / name / "cache"),
+                "online_tools": False,
+                "tool_process_workers": 1,
+            },
+            llm=FakeChatModel(
+                tool_call=INDICATOR_CALL, when_bound=INDICATOR_CALL["name"]
+            ),
+            selected_analysts=["market", "social"],
+        )
+    made["online"] = fake_graph(
+        {"online_tools": True}, selected_analysts=["market", "social"]
+    )
+    yield made
+    for graph in made.values():
+        graph.close()
+
+
+def assert_isolated(states):
+    assert "2024-05-10: 111.0" in states["a"]["market_report"]
+    assert "222.0" not in states["a"]["market_report"]
+    assert "2024-05-10: 222.0" in states["b"]["market_report"]
+    assert "111.0" not in states["b"]["market_report"]
+    for name in ("a", "b"):
+        assert states[name]["sentiment_report"] == "Report: get_reddit_stock_info"
+    assert states["online"]["market_report"] == (
+        "Report: get_YFin_data_online, get_stockstats_indicators_report_online"
+    )
+    assert states["online"]["sentiment_report"] == "Report: get_stock_news_openai"
+
+
+def test_graphs_in_threads_keep_their_settings(graphs):
+    with ThreadPoolExecutor(max_workers=len(graphs)) as executor:
+        futures = {
+            name: executor.submit(graph.propagate, "AAA", "2024-05-10")
+            for name, graph in graphs.items()
+        }
+    assert_isolated({name: future.result()[0] for name, future in futures.items()})
+
+
+def test_graphs_on_one_loop_keep_their_settings(graphs):
+    async def run():
+        return await asyncio.gather(
+            *(graph.apropagate("AAA", "2024-05-10") for graph in graphs.values())
+        )
+
+    results = asyncio.run(run())
+    assert_isolated({name: state for name, (state, _) in zip(graphs, results)})
+    for name in ("a", "b"):
+        # the indicator calls ran in the spawned tool process
+        assert graphs[name].tool_process_pool._processes
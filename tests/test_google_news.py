@@ -0,0 +1,124 @@
+import asyncio
+import contextvars
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+import tradingagents.dataflows.googlenews_utils as googlenews_utils
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.config import use_config
+from tradingagents.dataflows.googlenews_utils import afetch_news, fetch_news
+
+
+def result_page(page, has_next):
+    items = "".join(
+        f'<div class="SoaBEf"><a href="https://example.com/{page}/{i}">'
+        f'<div class="MBeuO">Title {page}-{i}</div>'
+        f'<div class="GI74Re">Snippet {page}-{i}</div>'
+        f'<div class="LfVVr">{i} hours ago</div>'
+        f'<div class="NUnG9d"><span>Source {i}</span></div></a></div>'
+        for i in range(10)
+    )
+    next_link = '<a id="pnnext" href="#">Next</a>' if has_next else ""
+    return f"<html><body>{items}{next_link}</body></html>"
+
+
+def scrape(handler):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await afetch_news("AAPL", "2024-01-01", "2024-01-07", client)
+
+    with use_config({"host_rate_limits": {}, "news_page_concurrency": 2}):
+        return asyncio.run(run())
+
+
+def page_of(request):
+    return int(urllib.parse.parse_qs(request.url.query.decode())["start"][0]) // 10
+
+
+def test_scrape_is_complete_when_the_last_page_is_reached():
+    results, complete = scrape(
+        lambda request: httpx.Response(
+            200, text=result_page(page_of(request), page_of(request) < 2)
+        )
+    )
+    assert complete
+    assert len(results) == 30
+
+
+def test_scrape_is_incomplete_when_a_page_fails():
+    def handler(request):
+        if page_of(request) == 1:
+            raise httpx.ConnectError("connection reset")
+        return httpx.Response(200, text=result_page(page_of(request), True))
+
+    results, complete = scrape(handler)
+    assert not complete
+    assert len(results) == 10
+
+
+@pytest.fixture
+def shared_client(monkeypatch):
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        return httpx.Response(200, text=result_page(page_of(request), False))
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(googlenews_utils, "_news_loop", loop)
+    monkeypatch.setattr(googlenews_utils, "_news_client", client)
+    yield hosts
+    asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_blocking_fetches_share_one_client(shared_client):
+    def fetch():
+        return fetch_news("AAPL", "2024-01-01", "2024-01-07")
+
+    async def fetch_in_loop():
+        return fetch()
+
+    settings = {"host_rate_limits": {}, "google_news_url": "https://news.test/search"}
+    with use_config(settings):
+        results = [fetch(), asyncio.run(fetch_in_loop())]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, fetch)
+                for _ in range(4)
+            ]
+        results += [future.result() for future in futures]
+    assert all(complete and len(found) == 10 for found, complete in results)
+    assert shared_client == ["news.test"] * len(results)
+
+
+@pytest.fixture
+def news_cache(tmp_path, monkeypatch):
+    calls = []
+
+    def fetch_news(query, start_date, end_date):
+        calls.append(query)
+        return [{"title": "t", "source": "s", "snippet": "x"}], len(calls) > 1
+
+    monkeypatch.setattr(interface, "fetch_news", fetch_news)
+    with use_config({"disk_cache_path": str(tmp_path / "cache.sqlite3")}):
+        yield calls
+
+
+def test_incomplete_scrape_is_not_cached(news_cache):
+    first = interface.get_google_news("AAPL", "2024-01-07", 7)
+    second = interface.get_google_news("AAPL", "2024-01-07", 7)
+    third = interface.get_google_news("AAPL", "2024-01-07", 7)
+
+    # the first scrape is incomplete, the second one is cached for good
+    assert len(news_cache) == 2
+    assert first == second == third
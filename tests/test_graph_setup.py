@@ -0,0 +1,81 @@
+import pytest
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import tool
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.graph.conditional_logic import ConditionalLogic
+from tradingagents.graph.propagation import Propagator
+from tradingagents.graph.setup import ANALYST_REPORT_KEYS, GraphSetup
+from tradingagents.graph.tool_node import ConcurrentToolNode
+
+from conftest import FakeChatModel, FakeMemory
+
+ANALYSTS = list(ANALYST_REPORT_KEYS)
+
+
+def lookup_node(analyst_type):
+    @tool
+    def lookup(topic: str) -> str:
+        """Look up a topic."""
+        return f"{analyst_type} data on {topic}"
+
+    return ConcurrentToolNode([lookup])
+
+
+def build_graph(prompts=None, **modes):
+    # every analyst calls the lookup tool of its own tool node before reporting
+    llm = FakeChatModel(
+        tool_call={"name": "lookup", "args": {"topic": "AAPL"}}, prompts=prompts
+    )
+    setup = GraphSetup(
+        llm,
+        llm,
+        Toolkit(),
+        {analyst_type: lookup_node(analyst_type) for analyst_type in ANALYSTS},
+        *(FakeMemory() for _ in range(5)),
+        ConditionalLogic(),
+    )
+    return setup.setup_graph(ANALYSTS, **modes)
+
+
+MODES = {
+    "sequential": {},
+    "isolated": {"isolate_analyst_messages": True},
+    "parallel": {"parallel_analysts": True},
+}
+
+
+@pytest.mark.parametrize("modes", MODES.values(), ids=MODES.keys())
+def test_researchers_run_once_after_every_analyst_reported(modes):
+    graph = build_graph(**modes)
+    state = Propagator().create_initial_state("AAPL", "2024-05-10")
+
+    order = []
+    final_state = dict(state)
+    for update in graph.stream(state, stream_mode="updates"):
+        for node, values in update.items():
+            order.append(node)
+            final_state.update(values or {})
+
+    for analyst_type, report_key in ANALYST_REPORT_KEYS.items():
+        assert final_state[report_key] == f"Report: {analyst_type} data on AAPL"
+
+    analysts = [f"{analyst_type.capitalize()} Analyst" for analyst_type in ANALYSTS]
+    last_analyst = max(i for i, node in enumerate(order) if node in analysts)
+    assert order.count("Bull Researcher") == 1
+    assert order.count("Bear Researcher") == 1
+    assert order.index("Bull Researcher") > last_analyst
+
+
+@pytest.mark.parametrize("modes", MODES.values(), ids=MODES.keys())
+def test_analysts_only_see_their_own_tool_results(modes):
+    prompts = []
+    graph = build_graph(prompts, **modes)
+
+    graph.invoke(Propagator().create_initial_state("AAPL", "2024-05-10"))
+
+    analyst_prompts = [messages for bound_tools, messages in prompts if bound_tools]
+    # each analyst is asked twice, before and after its tool call
+    assert len(analyst_prompts) == 2 * len(ANALYSTS)
+    for messages in analyst_prompts:
+        assert len([m for m in messages if isinstance(m, ToolMessage)]) <= 1
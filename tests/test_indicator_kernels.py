@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+from stockstats import wrap
+
+from tradingagents.dataflows.indicator_kernels import compute_indicators
+from tradingagents.dataflows.stockstats_utils import SUPPORTED_INDICATORS
+
+
+def price_history(n=600, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = close * rng.uniform(0.005, 0.03, n)
+    return pd.DataFrame(
+        {
+            "Date": pd.bdate_range("2020-01-01", periods=n).strftime("%Y-%m-%d"),
+            "Open": close + rng.normal(0, 0.5, n),
+            "High": close + spread,
+            "Low": close - spread,
+            "Close": close,
+            "Volume": rng.integers(100_000, 5_000_000, n).astype(float),
+        }
+    )
+
+
+def with_missing_bars(data, rows):
+    # yfinance reports missing sessions as rows with every field NaN
+    data = data.copy()
+    data.loc[rows, ["Open", "High", "Low", "Close", "Volume"]] = np.nan
+    return data
+
+
+@pytest.mark.parametrize(
+    "missing",
+    [[], [300], [0], [120, 121, 122], list(range(250, 275))],
+    ids=["complete", "one-bar", "first-bar", "three-bars", "long-gap"],
+)
+def test_kernels_match_stockstats(missing):
+    data = with_missing_bars(price_history(), missing)
+
+    expected = wrap(data.copy())
+    actual = compute_indicators(data, SUPPORTED_INDICATORS)
+
+    for indicator in SUPPORTED_INDICATORS:
+        reference = expected[indicator].to_numpy(dtype=float)
+        np.testing.assert_array_equal(
+            np.isnan(actual[indicator]), np.isnan(reference), err_msg=indicator
+        )
+        np.testing.assert_allclose(
+            actual[indicator], reference, rtol=1e-7, atol=1e-9, err_msg=indicator
+        )
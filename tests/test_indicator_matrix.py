@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.config import use_config
+from tradingagents.dataflows.price_store import get_price_store, offline_price_path
+from tradingagents.dataflows.stockstats_utils import StockstatsUtils
+
+
+def write_prices(price_dir, symbol, close, dates):
+    os.makedirs(price_dir, exist_ok=True)
+    pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": 1e6,
+        }
+    ).to_csv(offline_price_path(symbol, price_dir), index=False)
+
+
+@pytest.mark.parametrize("backend", ["stockstats", "numpy"])
+def test_matrix_is_not_shared_across_price_files(tmp_path, backend):
+    dates = pd.bdate_range("2020-01-01", periods=120)
+    closes = {"a": np.linspace(60, 62, 120), "b": np.linspace(180, 182, 120)}
+    for name, close in closes.items():
+        write_prices(str(tmp_path / name), "AAA", close, dates)
+
+    settings = {"data_cache_dir": str(tmp_path / "cache"), "indicator_backend": backend}
+    for restart in (False, True):
+        if restart:
+            get_price_store().clear()
+        for name, close in closes.items():
+            with use_config(settings):
+                sma = StockstatsUtils.get_indicator_series(
+                    "AAA", "close_50_sma", str(tmp_path / name)
+                )
+            assert sma.iloc[-1] == pytest.approx(close[-50:].mean())
+
+
+def test_matrix_is_rebuilt_when_prices_change(tmp_path):
+    dates = pd.bdate_range("2020-01-01", periods=120)
+    price_dir = str(tmp_path / "prices")
+    settings = {"data_cache_dir": str(tmp_path / "cache")}
+
+    for close in (np.linspace(60, 62, 120), np.linspace(70, 72, 120)):
+        write_prices(price_dir, "AAA", close, dates)
+        get_price_store().clear()
+        with use_config(settings):
+            sma = StockstatsUtils.get_indicator_series("AAA", "close_50_sma", price_dir)
+        assert sma.iloc[-1] == pytest.approx(close[-50:].mean())
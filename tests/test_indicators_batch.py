@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.config import use_config
+from tradingagents.dataflows.interface import get_stockstats_indicators_batch
+from tradingagents.dataflows.price_store import offline_price_path
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+INDICATORS = ["close_10_sma", "rsi"]
+# a Friday, the Saturday and Sunday after it and the next Monday
+DATES = ["2020-03-06", "2020-03-07", "2020-03-08", "2020-03-09"]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    price_dir = tmp_path / "data" / "market_data" / "price_data"
+    os.makedirs(price_dir)
+    dates = pd.bdate_range("2020-01-01", periods=60)
+    for i, symbol in enumerate(SYMBOLS):
+        close = np.linspace(50, 60, 60) * (i + 1)
+        pd.DataFrame(
+            {
+                "Date": dates.strftime("%Y-%m-%d"),
+                "Open": close,
+                "High": close + 1,
+                "Low": close - 1,
+                "Close": close,
+                "Adj Close": close,
+                "Volume": 1e6,
+            }
+        ).to_csv(offline_price_path(symbol, str(price_dir)), index=False)
+
+    settings = {
+        "data_dir": str(tmp_path / "data"),
+        "data_cache_dir": str(tmp_path / "cache"),
+    }
+    with use_config(settings):
+        yield
+
+
+def test_batch_returns_a_tidy_frame(data_dir):
+    frame = get_stockstats_indicators_batch(SYMBOLS, INDICATORS, DATES, max_workers=1)
+
+    assert list(frame.columns) == ["symbol", "date", "indicator", "value"]
+    assert len(frame) == len(SYMBOLS) * len(INDICATORS) * len(DATES)
+    weekend = frame["date"].isin(["2020-03-07", "2020-03-08"])
+    assert frame.loc[weekend, "value"].isna().all()
+    assert frame.loc[~weekend, "value"].notna().all()
+
+    sma = frame.set_index(["symbol", "indicator", "date"])["value"]
+    expected = np.linspace(50, 60, 60)[:48][-10:].mean() * 2
+    assert sma["BBB", "close_10_sma", "2020-03-06"] == pytest.approx(expected)
+
+
+def test_parallel_batch_equals_serial(data_dir):
+    serial = get_stockstats_indicators_batch(SYMBOLS, INDICATORS, DATES, max_workers=1)
+    parallel = get_stockstats_indicators_batch(
+        SYMBOLS, INDICATORS, DATES, max_workers=2
+    )
+
+    pd.testing.assert_frame_equal(parallel, serial)
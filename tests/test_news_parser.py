@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from tradingagents.dataflows.config import use_config
+from tradingagents.dataflows.googlenews_utils import parse_news_page
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "google_news")
+
+# saved result pages: number of results kept and whether a next page is linked
+PAGES = {
+    # a nested title, and a result without a snippet that is skipped
+    "first_page.html": (9, True),
+    "last_page.html": (6, False),
+    "no_results.html": (None, False),
+}
+
+
+def parse(name, parser):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        content = f.read()
+    with use_config({"news_html_parser": parser}):
+        return parse_news_page(content)
+
+
+@pytest.mark.parametrize("name", sorted(PAGES))
+def test_lxml_extractor_matches_bs4(name):
+    results, has_next = parse(name, "lxml")
+
+    assert (results, has_next) == parse(name, "bs4")
+    count, linked = PAGES[name]
+    assert (None if results is None else len(results)) == count
+    assert has_next == linked
+
+
+def test_extracted_fields():
+    results, _ = parse("first_page.html", "lxml")
+
+    assert results[3] == {
+        "link": "https://news.example.com/0/3?utm_source=google&id=3",
+        "title": "Apple’s Vision Pro pre-orders “exceed expectations”",
+        "snippet": (
+            "Shares of Apple Inc. moved -1.16% on Friday after… “quoted” text & more"
+        ),
+        "date": "Jan 5, 2024",
+        "source": "Yahoo Finance",
+    }
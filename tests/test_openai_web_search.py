@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.config import use_config
+
+
+@pytest.fixture
+def web_search(tmp_path, monkeypatch):
+    calls = []
+
+    def create(**request):
+        calls.append(request)
+        text = SimpleNamespace(text=f"answer {len(calls)}")
+        return SimpleNamespace(output=[None, SimpleNamespace(content=[text])])
+
+    client = SimpleNamespace(responses=SimpleNamespace(create=create))
+    monkeypatch.setattr(interface, "get_openai_client", lambda base_url: client)
+    # answers about open windows expire right away
+    settings = {
+        "disk_cache_path": str(tmp_path / "cache.sqlite3"),
+        "openai_response_cache": True,
+        "news_cache_ttl": 0,
+    }
+    with use_config(settings):
+        yield calls
+
+
+@pytest.mark.parametrize(
+    "search",
+    [
+        lambda date: interface.get_stock_news_openai("AAPL", date),
+        lambda date: interface.get_global_news_openai(date),
+        lambda date: interface.get_fundamentals_openai("AAPL", date),
+    ],
+    ids=["stock-news", "global-news", "fundamentals"],
+)
+def test_only_closed_windows_are_cached_for_good(web_search, search):
+    today = datetime.now().strftime("%Y-%m-%d")
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+
+    assert search(yesterday) == search(yesterday) == "answer 1"
+    assert search(today) == "answer 2"
+    assert search(today) == "answer 3"
+    assert len(web_search) == 3
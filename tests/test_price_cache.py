@@ -0,0 +1,86 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tradingagents.dataflows.price_cache as price_cache
+from tradingagents.dataflows.price_cache import (
+    load_yfin_history,
+    read_price_frame,
+    write_price_frame,
+)
+
+
+def prices(close, n=2000):
+    dates = pd.bdate_range("2010-01-01", periods=n)
+    return pd.DataFrame(
+        {"Date": dates.strftime("%Y-%m-%d"), "Close": np.full(n, close)}
+    )
+
+
+def test_concurrent_writes_of_one_symbol_do_not_mix(tmp_path):
+    path = str(tmp_path / "AAA-YFin-data.csv")
+    frames = [prices(float(i)) for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda data: write_price_frame(data, path), frames * 4))
+
+    data = read_price_frame(path)
+    assert len(data) == 2000
+    assert data["Close"].nunique() == 1
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+
+@pytest.fixture
+def yf_download(monkeypatch):
+    """Fake yf.download serving five bars of AAA, or none once ``empty`` is set."""
+    bars = pd.DataFrame(
+        {"Close": np.arange(5.0), "Volume": 1e6},
+        index=pd.bdate_range("2024-05-01", periods=5, name="Date"),
+    )
+    fake = {"empty": False, "calls": 0}
+
+    def download(symbol, start, end, **kwargs):
+        fake["calls"] += 1
+        served = bars[(bars.index >= start) & (bars.index < end)]
+        if symbol != "AAA" or fake["empty"]:
+            # what yfinance returns when it finds no bars
+            return pd.DataFrame(columns=bars.columns)
+        return served
+
+    monkeypatch.setattr(price_cache.yf, "download", download)
+    return fake
+
+
+def read_meta(cache_dir, symbol):
+    with open(os.path.join(cache_dir, f"{symbol}-YFin-data.json")) as f:
+        return json.load(f)
+
+
+def test_a_download_without_bars_advances_the_cache(tmp_path, yf_download):
+    cache_dir = str(tmp_path)
+    first = load_yfin_history("AAA", cache_dir, "2024-05-01", "2024-05-04")
+
+    yf_download["empty"] = True
+    later = load_yfin_history("AAA", cache_dir, "2024-05-01", "2024-05-06")
+    calls = yf_download["calls"]
+    again = load_yfin_history("AAA", cache_dir, "2024-05-01", "2024-05-06")
+
+    pd.testing.assert_frame_equal(later, first)
+    pd.testing.assert_frame_equal(again, first)
+    assert read_meta(cache_dir, "AAA") == {
+        "start_date": "2024-05-01",
+        "last_bar": "2024-05-03",
+        "fetched_through": "2024-05-06",
+    }
+    assert yf_download["calls"] == calls
+
+
+def test_an_unknown_symbol_has_no_bars(tmp_path, yf_download):
+    data = load_yfin_history("ZZZ", str(tmp_path), "2024-05-01", "2024-05-06")
+
+    assert data.empty
+    assert read_meta(str(tmp_path), "ZZZ")["fetched_through"] == "2024-05-06"
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.dataflows.config import use_config
+from tradingagents.dataflows.price_store import get_price_store
+
+
+def frame(rows=100):
+    return pd.DataFrame(
+        {"Close": np.arange(rows, dtype=float)},
+        index=pd.bdate_range("2024-01-01", periods=rows),
+    )
+
+
+@pytest.fixture
+def store():
+    store = get_price_store()
+    store.clear()
+    yield store
+    store.clear()
+
+
+def test_a_smaller_budget_evicts_at_once(store):
+    size = int(frame().memory_usage(deep=True).sum())
+    with use_config({"price_cache_max_bytes": 10 * size}):
+        for symbol in ("AAA", "BBB", "CCC"):
+            get_price_store().get(symbol, "offline", "", "", frame)
+    assert store.stats()["entries"] == 3
+
+    with use_config({"price_cache_max_bytes": size}):
+        stats = get_price_store().stats()
+
+    assert stats["entries"] == 1
+    assert stats["bytes"] <= stats["max_bytes"] == size
+    # the most recently used frame is kept
+    with use_config({"price_cache_max_bytes": size}):
+        get_price_store().get("CCC", "offline", "", "", pytest.fail)
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.graph import START, MessagesState, StateGraph
+
+from tradingagents.graph.tool_node import ConcurrentToolNode
+
+
+class Tracker:
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.running -= 1
+
+
+@pytest.fixture
+def tracker():
+    return Tracker()
+
+
+@pytest.fixture
+def wait_tool(tracker):
+    @tool
+    def wait(seconds: float) -> str:
+        """Wait for some seconds."""
+        with tracker:
+            time.sleep(seconds)
+        return f"waited {seconds}"
+
+    return wait
+
+
+def tool_calls(count):
+    # later calls finish first
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {"name": "wait", "args": {"seconds": 0.02 * (count - i)}, "id": f"call-{i}"}
+            for i in range(count)
+        ],
+    )
+
+
+def tools_graph(node):
+    # tool nodes run inside a graph, which provides their store
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", node)
+    graph.add_edge(START, "tools")
+    return graph.compile()
+
+
+def assert_in_call_order(result, count):
+    messages = result["messages"][1:]
+    assert [m.tool_call_id for m in messages] == [f"call-{i}" for i in range(count)]
+    assert [m.content for m in messages] == [
+        f"waited {0.02 * (count - i)}" for i in range(count)
+    ]
+
+
+def test_invoke_is_bounded_and_keeps_call_order(wait_tool, tracker):
+    graph = tools_graph(ConcurrentToolNode([wait_tool], max_workers=3))
+
+    result = graph.invoke({"messages": [tool_calls(8)]})
+
+    assert_in_call_order(result, 8)
+    assert tracker.peak == 3
+
+
+def test_ainvoke_is_bounded_across_runs_and_keeps_call_order(wait_tool, tracker):
+    graph = tools_graph(ConcurrentToolNode([wait_tool], max_workers=3))
+
+    async def run():
+        return await asyncio.gather(
+            *(graph.ainvoke({"messages": [tool_calls(8)]}) for _ in range(2))
+        )
+
+    for result in asyncio.run(run()):
+        assert_in_call_order(result, 8)
+    assert tracker.peak == 3
+
+
+class FailingPool(Executor):
+    def __init__(self, error):
+        self.error = error
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(self.error)
+        return future
+
+
+def run_in_pool(wait_tool, error):
+    node = ConcurrentToolNode(
+        [wait_tool], process_tools=["wait"], process_pool=FailingPool(error)
+    )
+    return tools_graph(node).invoke({"messages": [tool_calls(1)]})["messages"][-1]
+
+
+def test_tool_error_in_the_pool_is_not_run_again(wait_tool, tracker):
+    message = run_in_pool(wait_tool, ValueError("bad window"))
+
+    assert message.status == "error"
+    assert "bad window" in message.content
+    assert tracker.calls == 0
+
+
+def test_broken_pool_falls_back_to_the_thread(wait_tool, tracker):
+    message = run_in_pool(wait_tool, BrokenProcessPool("worker died"))
+
+    assert message.content == "waited 0.02"
+    assert tracker.calls == 1
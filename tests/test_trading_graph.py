@@ -0,0 +1,35 @@
+import asyncio
+
+from conftest import DECISION
+
+
+def without_messages(state):
+    # message ids are random
+    return {key: value for key, value in state.items() if key != "messages"}
+
+
+def test_apropagate_matches_propagate(fake_graph):
+    graph = fake_graph()
+
+    state, decision = graph.propagate("AAPL", "2024-05-10")
+    astate, adecision = asyncio.run(graph.apropagate("AAPL", "2024-05-10"))
+
+    assert adecision == decision == DECISION
+    assert without_messages(astate) == without_messages(state)
+    assert state["final_trade_decision"] == DECISION
+
+
+def test_apropagate_sets_the_ticker_before_the_run(fake_graph):
+    graph = fake_graph()
+    seen = []
+
+    def get_memories(current_situation, n_matches=1):
+        seen.append(graph.ticker)
+        return []
+
+    graph.bull_memory.get_memories = get_memories
+    graph.ticker = "MSFT"
+    asyncio.run(graph.apropagate("AAPL", "2024-05-10"))
+
+    assert seen == ["AAPL"]
+    assert graph.ticker == "AAPL"
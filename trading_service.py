@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import json
@@ -11,6 +12,7 @@ from typing import List, Dict, Any
 sys.path.append('/app')
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.batch_runner import BatchJob, BatchRunner
 from tradingagents.default_config import DEFAULT_CONFIG
 from integrations.feishu_bot import FeishuBot
 
@@ -35,7 +37,9 @@ class TradingService:
         self.config["online_tools"] = True
         
         # 初始化组件
-        self.trading_graph = TradingAgentsGraph(debug=True, config=self.config)
+        # 批量分析并发运行，调试输出会在日志中交错，因此关闭 debug
+        self.trading_graph = TradingAgentsGraph(debug=False, config=self.config)
+        self.batch_runner = BatchRunner(self.trading_graph)
         self.feishu_bot = FeishuBot()
         
         # 默认监控的股票列表
@@ -63,7 +67,17 @@ class TradingService:
             
             # 运行交易分析
             state, decision = self.trading_graph.propagate(ticker, date)
+            return self._publish_result(ticker, date, state, decision)
             
+        except Exception as e:
+            error_msg = f"分析股票 {ticker} 时出错: {str(e)}"
+            logger.error(error_msg)
+            self.feishu_bot.send_error_notification(error_msg, ticker)
+            return None
+    
+    def _publish_result(self, ticker: str, date: str, state: Dict, decision) -> Dict[str, Any]:
+        """保存分析结果并发送到飞书"""
+        try:
             # 提取分析摘要
             analysis_summary = self._extract_analysis_summary(state)
             
@@ -131,20 +145,9 @@ class TradingService:
     def run_daily_analysis(self):
         """运行每日分析"""
         logger.info("开始每日股票分析...")
-        results = []
-        
-        for ticker in self.tickers:
-            try:
-                result = self.analyze_stock(ticker)
-                if result:
-                    results.append(result)
-                    
-                # 避免API限制，添加延迟
-                time.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"分析 {ticker} 时出错: {str(e)}")
-                continue
+        date = datetime.now().strftime('%Y-%m-%d')
+        jobs = [BatchJob(ticker, date) for ticker in self.tickers]
+        results = asyncio.run(self._run_batch(jobs))
         
         # 发送每日摘要
         if results:
@@ -153,6 +156,29 @@ class TradingService:
         else:
             logger.warning("今日没有成功分析任何股票")
     
+    async def _run_batch(self, jobs: List[BatchJob]) -> List[Dict[str, Any]]:
+        """并发分析多只股票, 每完成一只就保存并发送结果"""
+        results = []
+        
+        # 并发数、重试和API限流由 BatchRunner 按配置处理
+        async for item in self.batch_runner.stream(jobs):
+            if item.error is not None:
+                error_msg = f"分析股票 {item.ticker} 时出错 (尝试 {item.attempts} 次): {str(item.error)}"
+                logger.error(error_msg)
+                await asyncio.to_thread(
+                    self.feishu_bot.send_error_notification, error_msg, item.ticker
+                )
+                continue
+            
+            logger.info(f"股票 {item.ticker} 分析耗时 {item.seconds:.1f}s, 使用 {item.tokens} tokens")
+            result = await asyncio.to_thread(
+                self._publish_result, item.ticker, item.trade_date, item.final_state, item.decision
+            )
+            if result:
+                results.append(result)
+        
+        return results
+    
     def run_single_analysis(self, ticker: str):
         """运行单只股票分析（用于测试）"""
         return self.analyze_stock(ticker)
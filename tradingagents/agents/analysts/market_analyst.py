@@ -1,11 +1,14 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import truncate_tool_results
+
 
 def create_market_analyst(llm, toolkit):
 
-    def market_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -72,18 +75,25 @@ Volume-Based Indicators:
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def make_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
             report = result.content
-       
+
         return {
             "messages": [result],
             "market_report": report,
         }
 
-    return market_analyst_node
+    def market_analyst_node(state):
+        messages = truncate_tool_results(state["messages"], toolkit.config)
+        return make_update(build_chain(state).invoke(messages))
+
+    async def amarket_analyst_node(state):
+        messages = truncate_tool_results(state["messages"], toolkit.config)
+        return make_update(await build_chain(state).ainvoke(messages))
+
+    return RunnableLambda(market_analyst_node, afunc=amarket_analyst_node)
@@ -1,10 +1,13 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import truncate_tool_results
+
 
 def create_social_media_analyst(llm, toolkit):
-    def social_media_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -43,10 +46,9 @@ def create_social_media_analyst(llm, toolkit):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def make_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -57,4 +59,12 @@ def create_social_media_analyst(llm, toolkit):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    def social_media_analyst_node(state):
+        messages = truncate_tool_results(state["messages"], toolkit.config)
+        return make_update(build_chain(state).invoke(messages))
+
+    async def asocial_media_analyst_node(state):
+        messages = truncate_tool_results(state["messages"], toolkit.config)
+        return make_update(await build_chain(state).ainvoke(messages))
+
+    return RunnableLambda(social_media_analyst_node, afunc=asocial_media_analyst_node)
@@ -31,12 +31,45 @@ def create_msg_delete():
     return delete_messages
 
 
+def truncate_tool_results(messages, config):
+    """Truncate older tool results before the messages are sent to an LLM.
+
+    The last ``context_keep_tool_results`` tool messages are kept in full and
+    older ones are cut to their first ``context_truncate_chars`` characters,
+    with a note of how much was left out; they are not summarized.
+    Tool messages are never dropped, so every tool call keeps its result.
+    A keep count of 0 leaves the messages unchanged.
+    """
+    keep = config.get("context_keep_tool_results", 0)
+    if keep <= 0:
+        return messages
+
+    limit = config.get("context_truncate_chars", 500)
+    tool_positions = [
+        i for i, message in enumerate(messages) if isinstance(message, ToolMessage)
+    ]
+    older = set(tool_positions[: max(len(tool_positions) - keep, 0)])
+
+    truncated = []
+    for i, message in enumerate(messages):
+        content = message.content
+        if i in older and isinstance(content, str) and len(content) > limit:
+            message = message.model_copy(
+                update={
+                    "content": content[:limit]
+                    + f"\n... [{len(content) - limit} more characters of this earlier {message.name} result omitted]"
+                }
+            )
+        truncated.append(message)
+    return truncated
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
     @classmethod
     def update_config(cls, config):
-        """Update the class-level configuration."""
+        """Update the class-level configuration that new toolkits start from."""
         cls._config.update(config)
 
     @property
@@ -45,8 +78,9 @@ class Toolkit:
         return self._config
 
     def __init__(self, config=None):
-        if config:
-            self.update_config(config)
+        # each toolkit keeps its own configuration, so the toolkits of
+        # concurrently running graphs do not change each other's settings
+        self._config = {**Toolkit._config, **(config or {})}
 
     @staticmethod
     @tool
@@ -1,8 +1,9 @@
 from .finnhub_utils import get_data_in_range
 from .googlenews_utils import getNewsData
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import build_reddit_index, fetch_top_from_category
 from .stockstats_utils import StockstatsUtils
+from .price_store import PriceStore, get_price_store
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -20,6 +21,7 @@ from .interface import (
     # Technical analysis functions
     get_stock_stats_indicators_window,
     get_stockstats_indicator,
+    get_stockstats_indicators_batch,
     # Market data functions
     get_YFin_data_window,
     get_YFin_data,
@@ -40,6 +42,7 @@ __all__ = [
     # Technical analysis functions
     "get_stock_stats_indicators_window",
     "get_stockstats_indicator",
+    "get_stockstats_indicators_batch",
     # Market data functions
     "get_YFin_data_window",
     "get_YFin_data",
@@ -1,8 +1,16 @@
 import tradingagents.default_config as default_config
-from typing import Dict, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
 
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
+# Configuration of the current context, set by use_config
+_context_config: ContextVar[Optional[Dict]] = ContextVar(
+    "tradingagents_config", default=None
+)
+# Process-wide data_dir, kept for callers that imported it; use
+# get_config()["data_dir"], which also honours use_config
 DATA_DIR: Optional[str] = None
 
 
@@ -15,19 +23,53 @@ def initialize_config():
 
 
 def set_config(config: Dict):
-    """Update the configuration with custom values."""
+    """Update the configuration with custom values.
+
+    Inside a use_config block only that block's configuration is updated,
+    otherwise the process-wide one.
+    """
     global _config, DATA_DIR
+    scoped = _context_config.get()
+    if scoped is not None:
+        _context_config.set({**scoped, **config})
+        return
+
     if _config is None:
-        _config = default_config.DEFAULT_CONFIG.copy()
-    _config.update(config)
+        initialize_config()
+    # replace rather than update, dicts handed out by get_config stay unchanged
+    _config = {**_config, **config}
     DATA_DIR = _config["data_dir"]
 
 
+@contextmanager
+def use_config(config: Dict) -> Iterator[Dict]:
+    """Use the current configuration updated with custom values in a block.
+
+    The configuration is held in a context variable, so it applies to the
+    current thread or asyncio task (and the tasks and executor calls started
+    from it) without affecting concurrent runs with other settings.
+    """
+    scoped = {**get_config(), **config}
+    token = _context_config.set(scoped)
+    try:
+        yield scoped
+    finally:
+        _context_config.reset(token)
+
+
 def get_config() -> Dict:
-    """Get the current configuration."""
+    """Get the current configuration.
+
+    The returned dict is not a copy: it is shared with every other caller in
+    the same context, including concurrent tool calls of a run. It must not
+    be modified; use set_config or use_config to change settings.
+    """
+    scoped = _context_config.get()
+    if scoped is not None:
+        return scoped
     if _config is None:
         initialize_config()
-    return _config.copy()
+    return _config
 
 
 # Initialize with default config
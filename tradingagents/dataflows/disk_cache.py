@@ -0,0 +1,110 @@
+"""Persistent key-value cache of tool results, shared across runs.
+
+Entries live in a SQLite database under namespaces (one per kind of result)
+and are stored as JSON. An entry either never expires or expires a given
+number of seconds after it was written. Hit and miss counts are persisted
+per namespace so that the savings of scheduled runs can be inspected.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+from .config import get_config
+
+
+class DiskCache:
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "namespace TEXT, key TEXT, value TEXT, created REAL, expires REAL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                "namespace TEXT PRIMARY KEY, hits INTEGER, misses INTEGER)"
+            )
+
+    def _connect(self):
+        # one short-lived connection per operation keeps the cache thread-safe
+        return closing(sqlite3.connect(self.path, timeout=30.0))
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Cached value of the key, None when it is missing or expired."""
+        now = time.time()
+        with self._connect() as conn, conn:
+            row = conn.execute(
+                "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                row = None
+
+            hit = row is not None
+            conn.execute(
+                "INSERT INTO stats VALUES (?, ?, ?) ON CONFLICT(namespace) DO UPDATE "
+                "SET hits = hits + excluded.hits, misses = misses + excluded.misses",
+                (namespace, int(hit), int(not hit)),
+            )
+        return json.loads(row[0]) if hit else None
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a JSON-serializable value, expiring after ttl seconds if given."""
+        now = time.time()
+        with self._connect() as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (
+                    namespace,
+                    key,
+                    json.dumps(value),
+                    now,
+                    None if ttl is None else now + ttl,
+                ),
+            )
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._connect() as conn, conn:
+            if namespace is None:
+                conn.execute("DELETE FROM entries")
+            else:
+                conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hits, misses and stored entries of each namespace."""
+        with self._connect() as conn:
+            stats = {
+                namespace: {"hits": hits, "misses": misses, "entries": 0}
+                for namespace, hits, misses in conn.execute("SELECT * FROM stats")
+            }
+            for namespace, count in conn.execute(
+                "SELECT namespace, COUNT(*) FROM entries GROUP BY namespace"
+            ):
+                stats.setdefault(namespace, {"hits": 0, "misses": 0})["entries"] = count
+        return stats
+
+
+_caches: Dict[str, DiskCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_disk_cache() -> DiskCache:
+    """Get the shared disk cache at the configured location."""
+    path = get_config()["disk_cache_path"]
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = DiskCache(path)
+        return _caches[path]
@@ -1,5 +1,57 @@
 import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class FinnhubIndex(NamedTuple):
+    """Non-empty entries of a finnhub data file, sorted by their date key."""
+
+    dates: List[str]
+    values: List[list]
+    positions: List[int]  # order of each entry in the file
+
+
+# Loaded files by path, together with the (mtime, size) they were loaded at
+_loaded: Dict[str, Tuple[Tuple[float, int], FinnhubIndex]] = {}
+_loaded_lock = threading.Lock()
+
+
+def _build_index(data: dict) -> FinnhubIndex:
+    entries = sorted(
+        (key, position, value)
+        for position, (key, value) in enumerate(data.items())
+        if len(value) > 0
+    )
+    return FinnhubIndex(
+        dates=[key for key, _, _ in entries],
+        values=[value for _, _, value in entries],
+        positions=[position for _, position, _ in entries],
+    )
+
+
+def load_finnhub_index(data_path: str) -> FinnhubIndex:
+    """Load a formatted finnhub json file once per process, reloading it when it changes."""
+    stat = os.stat(data_path)
+    version = (stat.st_mtime, stat.st_size)
+
+    with _loaded_lock:
+        cached = _loaded.get(data_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with open(data_path, "r") as f:
+        index = _build_index(json.load(f))
+
+    with _loaded_lock:
+        _loaded[data_path] = (version, index)
+    return index
+
+
+def clear_finnhub_cache():
+    with _loaded_lock:
+        _loaded.clear()
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -25,12 +77,10 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
+    index = load_finnhub_index(data_path)
 
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+    # range query on the sorted date keys, returned in the order of the file
+    lo = bisect_left(index.dates, start_date)
+    hi = bisect_right(index.dates, end_date)
+    selected = sorted(range(lo, hi), key=index.positions.__getitem__)
+    return {index.dates[i]: index.values[i] for i in selected}
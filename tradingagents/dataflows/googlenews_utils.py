@@ -1,9 +1,11 @@
+import asyncio
 import json
-import requests
+import threading
+import httpx
+import lxml.html
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
-import random
+from typing import Optional, Tuple
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -12,6 +14,17 @@ from tenacity import (
     retry_if_result,
 )
 
+from .config import get_config, use_config
+from .rate_limiter import get_host_limiter
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -23,20 +36,148 @@ def is_rate_limited(response):
     wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
 )
-def make_request(url, headers):
+async def make_request(client, url):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
-    return response
+    # Wait for the host's rate limiter instead of a fixed delay
+    limiter = get_host_limiter(url)
+    if limiter is not None:
+        await limiter.acquire_async()
+    return await client.get(url)
 
 
-def getNewsData(query, start_date, end_date):
+def parse_news_page(content):
+    """
+    Extract the news results of one search result page.
+    Returns the list of results, None when the page has no results, and
+    whether the page links to a next page. The parser is chosen by the
+    news_html_parser setting: "lxml" (default) or "bs4".
+    """
+    if get_config()["news_html_parser"] == "bs4":
+        return _parse_news_page_bs4(content)
+    return _parse_news_page_lxml(content)
+
+
+def _parse_news_page_bs4(content):
+    soup = BeautifulSoup(content, "html.parser")
+    results_on_page = soup.select("div.SoaBEf")
+
+    if not results_on_page:
+        return None, False
+
+    news_results = []
+    for el in results_on_page:
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    # Check for the "Next" link (pagination)
+    return news_results, soup.find("a", id="pnnext") is not None
+
+
+# result pages are served as utf-8
+_UTF8_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+
+def _has_class(el, name):
+    return name in (el.get("class") or "").split()
+
+
+def _extract_result(el):
+    """Fields of one result, collected in a single pass over its subtree."""
+    link = title = snippet = date = source = None
+    for child in el.iterdescendants():
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
+        if link is None and tag == "a":
+            link = child.attrib["href"]
+        classes = (child.get("class") or "").split()
+        if not classes:
+            continue
+        if title is None and tag == "div" and "MBeuO" in classes:
+            title = child.text_content()
+        if snippet is None and "GI74Re" in classes:
+            snippet = child.text_content()
+        if date is None and "LfVVr" in classes:
+            date = child.text_content()
+        if source is None and "NUnG9d" in classes:
+            span = next(child.iterdescendants("span"), None)
+            if span is not None:
+                source = span.text_content()
+
+    for name, value in (
+        ("link", link),
+        ("title", title),
+        ("snippet", snippet),
+        ("date", date),
+        ("source", source),
+    ):
+        if value is None:
+            raise ValueError(f"no {name} found")
+    return {
+        "link": link,
+        "title": title,
+        "snippet": snippet,
+        "date": date,
+        "source": source,
+    }
+
+
+def _parse_news_page_lxml(content):
+    if not content.strip():
+        return None, False
+    root = lxml.html.fromstring(content, parser=_UTF8_PARSER)
+
+    results_on_page = []
+    has_next = False
+    for el in root.iter("div", "a"):
+        if el.tag == "a":
+            has_next = has_next or el.get("id") == "pnnext"
+        elif _has_class(el, "SoaBEf"):
+            results_on_page.append(el)
+
+    if not results_on_page:
+        return None, False
+
+    news_results = []
+    for el in results_on_page:
+        try:
+            news_results.append(_extract_result(el))
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    return news_results, has_next
+
+
+async def afetch_news(query, start_date, end_date, client=None):
     """
     Scrape Google News search results for a given query and date range.
+    Result pages are requested in bounded concurrent windows through one
+    connection pool, paced by the rate limiter of the search host.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    client: httpx.AsyncClient - optional client to share across queries
+    Returns the results and whether the scrape completed. A page that still
+    fails after the retries ends the scrape with the results collected so far.
     """
     if "-" in start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
@@ -45,64 +186,106 @@ def getNewsData(query, start_date, end_date):
         end_date = datetime.strptime(end_date, "%Y-%m-%d")
         end_date = end_date.strftime("%m/%d/%Y")
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    if client is None:
+        async with httpx.AsyncClient(
+            headers=HEADERS, timeout=30.0, follow_redirects=True
+        ) as client:
+            return await afetch_news(query, start_date, end_date, client)
+
+    config = get_config()
+    base_url = config["google_news_url"]
+    concurrency = max(1, config["news_page_concurrency"])
 
     news_results = []
     page = 0
     while True:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
+        # the first page alone tells whether more pages are worth requesting
+        window = 1 if page == 0 else concurrency
+        urls = [
+            f"{base_url}?q={query}"
             f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
+            f"&tbm=nws&start={offset * 10}"
+            for offset in range(page, page + window)
+        ]
+        responses = await asyncio.gather(
+            *(make_request(client, url) for url in urls), return_exceptions=True
         )
 
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
-
-            page += 1
+        # pages are consumed in order, later pages of the window are dropped
+        # once a page without results or without a next link is reached
+        for response in responses:
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                results_on_page, has_next = parse_news_page(response.content)
+            except Exception as e:
+                print(f"Failed after multiple retries: {e}")
+                return news_results, False
+
+            if results_on_page is None:
+                return news_results, True  # No more results found
+            news_results.extend(results_on_page)
+            if not has_next:
+                return news_results, True
+
+        page += window
+
+
+async def agetNewsData(query, start_date, end_date, client=None):
+    """
+    Scrape Google News search results for a given query and date range.
+    See afetch_news; a failed page ends the results early.
+    """
+    news_results, _ = await afetch_news(query, start_date, end_date, client)
+    return news_results
+
+
+# Event loop thread and client of the blocking fetches. An AsyncClient is bound
+# to the loop it is used on, so the fetches of all threads run on this one loop
+# to share the client's connection pool.
+_news_loop: Optional[asyncio.AbstractEventLoop] = None
+_news_client: Optional[httpx.AsyncClient] = None
+_news_lock = threading.Lock()
 
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
 
+def _get_news_loop() -> Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]:
+    global _news_loop, _news_client
+    with _news_lock:
+        if _news_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="google-news", daemon=True
+            ).start()
+            _news_client = httpx.AsyncClient(
+                headers=HEADERS, timeout=30.0, follow_redirects=True
+            )
+            _news_loop = loop
+        return _news_loop, _news_client
+
+
+def fetch_news(query, start_date, end_date):
+    """
+    Blocking afetch_news, returns the results and whether the scrape completed.
+    The fetch runs on a shared event loop thread through one client, so
+    connections are reused across calls and threads.
+    """
+    loop, client = _get_news_loop()
+    # the loop thread does not run in the caller's context, carry its settings
+    config = get_config()
+
+    async def fetch():
+        with use_config(config):
+            return await afetch_news(query, start_date, end_date, client)
+
+    return asyncio.run_coroutine_threadsafe(fetch(), loop).result()
+
+
+def getNewsData(query, start_date, end_date):
+    """
+    Scrape Google News search results for a given query and date range.
+    query: str - search query
+    start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
+    end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    """
+    news_results, _ = fetch_news(query, start_date, end_date)
     return news_results
@@ -0,0 +1,247 @@
+"""NumPy implementations of the indicators offered to the market analyst.
+
+The kernels reproduce the stockstats (0.6.5) definitions of the supported
+indicators, including its warm-up behaviour (rolling windows with
+min_periods=1 and bias-adjusted exponential averages), without wrapping or
+copying the price frame. Missing bars (NaN) are handled the way pandas does:
+rolling windows skip them and exponential averages keep decaying over them
+(ewm ignore_na=False). Select them with ``indicator_backend = "numpy"``.
+"""
+
+from typing import Annotated, Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+BOLL_PERIOD = 20
+BOLL_STD_TIMES = 2
+RSI_WINDOW = 14
+ATR_WINDOW = 14
+VWMA_WINDOW = 14
+MFI_WINDOW = 14
+MACD_WINDOWS = (12, 26, 9)
+
+# Bumped whenever a kernel's output changes, so persisted matrices are rebuilt
+KERNELS_VERSION = 2
+
+
+def _shift_forward(x: np.ndarray) -> np.ndarray:
+    """Previous value of each element, the first element repeating itself."""
+    out = np.empty_like(x)
+    out[0] = x[0]
+    out[1:] = x[:-1]
+    return out
+
+
+def _trailing_sum(x: np.ndarray, window: int) -> np.ndarray:
+    cumsum = np.cumsum(x)
+    out = cumsum.copy()
+    out[window:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+def rolling_count(x: np.ndarray, window: int) -> np.ndarray:
+    """Number of non-NaN values in the trailing window."""
+    return _trailing_sum(~np.isnan(x), window).astype(float)
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing window, using the partial window at the start.
+
+    NaN values are skipped; a window without any value sums to NaN.
+    """
+    missing = np.isnan(x)
+    if not missing.any():
+        return _trailing_sum(x, window)
+    out = _trailing_sum(np.where(missing, 0.0, x), window)
+    out[rolling_count(x, window) == 0] = np.nan
+    return out
+
+
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return rolling_sum(x, window) / rolling_count(x, window)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Sample standard deviation over the trailing window (NaN for one value)."""
+    if np.isnan(x).any():
+        # pad the start so every window is full, then skip the NaN values
+        padded = np.concatenate([np.full(window - 1, np.nan), x])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+        count = (~np.isnan(windows)).sum(axis=1)
+        out = np.full(len(x), np.nan)
+        enough = count >= 2
+        with np.errstate(invalid="ignore"):
+            out[enough] = np.nanstd(windows[enough], axis=1, ddof=1)
+        return out
+
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1 :] = np.lib.stride_tricks.sliding_window_view(x, window).std(
+            axis=1, ddof=1
+        )
+    # partial windows at the start of the series, centred for precision
+    head = x[: window - 1] - x[: window - 1].mean()
+    count = np.arange(1, len(head) + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (np.cumsum(head * head) - np.cumsum(head) ** 2 / count) / (count - 1)
+    out[1 : len(head)] = np.sqrt(np.maximum(var[1:], 0.0))
+    return out
+
+
+def _decay_sum(x: np.ndarray, decay: float) -> np.ndarray:
+    """y[t] = decay * y[t-1] + x[t], evaluated block-wise with cumulative sums.
+
+    Within a block y[s+k] = decay**k * (decay * y[s-1] + sum_j x[s+j] / decay**j),
+    so all blocks are solved with one cumsum and only the carry between blocks
+    is propagated in a loop. Blocks are kept short enough that the inverse
+    powers stay well inside the float64 range.
+    """
+    if decay == 0.0:
+        return x.astype(float)
+
+    n = len(x)
+    block = int(max(1, min(64, 300.0 / -np.log(decay))))
+    n_blocks = -(-n // block)
+    padded = np.zeros(n_blocks * block)
+    padded[:n] = x
+    powers = decay ** np.arange(block)
+    local = powers * np.cumsum(padded.reshape(n_blocks, block) / powers, axis=1)
+
+    carries = np.empty(n_blocks)
+    carry = 0.0
+    block_decay = decay**block
+    for b in range(n_blocks):
+        carries[b] = carry
+        carry = block_decay * carry + local[b, -1]
+
+    return (local + np.outer(carries, powers * decay)).ravel()[:n]
+
+
+def ewm_mean(x: np.ndarray, alpha: float) -> np.ndarray:
+    """Bias-adjusted exponential moving average (pandas ewm(adjust=True)).
+
+    With NaN values the weights still decay by position (ignore_na=False):
+    the average is the decayed sum of the values over the decayed sum of
+    their weights, and holds its last value over missing bars.
+    """
+    decay = 1.0 - alpha
+    missing = np.isnan(x)
+    if missing.any():
+        weights = _decay_sum((~missing).astype(float), decay)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = _decay_sum(np.where(missing, 0.0, x), decay) / weights
+        out[weights == 0] = np.nan
+        return out
+
+    steps = np.arange(1, len(x) + 1)
+    if decay == 0.0:
+        weights = np.ones(len(x))
+    else:
+        weights = (1.0 - decay**steps) / alpha
+    return _decay_sum(x, decay) / weights
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    return ewm_mean(x, 2.0 / (span + 1))
+
+
+def smma(x: np.ndarray, window: int) -> np.ndarray:
+    return ewm_mean(x, 1.0 / window)
+
+
+def _typical_price(close, high, low) -> np.ndarray:
+    return (close + high + low) / 3.0
+
+
+def _macd(close):
+    short_w, long_w, signal_w = MACD_WINDOWS
+    macd = ema(close, short_w) - ema(close, long_w)
+    macds = ema(macd, signal_w)
+    return macd, macds, macd - macds
+
+
+def _rsi(close):
+    change = np.zeros_like(close)
+    change[1:] = np.diff(close)
+    up = smma(np.maximum(change, 0.0), RSI_WINDOW)
+    down = smma(np.maximum(-change, 0.0), RSI_WINDOW)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1.0 + up / down)
+
+
+def _boll(close):
+    mid = sma(close, BOLL_PERIOD)
+    width = BOLL_STD_TIMES * rolling_std(close, BOLL_PERIOD)
+    return mid, mid + width, mid - width
+
+
+def _atr(close, high, low):
+    prev_close = _shift_forward(close)
+    # the largest of the ranges that are known, as pandas' max(axis=1)
+    tr = np.fmax(
+        high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+    return smma(tr, ATR_WINDOW)
+
+
+def _vwma(close, high, low, volume):
+    tpv = volume * _typical_price(close, high, low)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return rolling_sum(tpv, VWMA_WINDOW) / rolling_sum(volume, VWMA_WINDOW)
+
+
+def _mfi(close, high, low, volume):
+    tp = _typical_price(close, high, low)
+    money_flow = np.nan_to_num(tp * volume)
+    delta = np.nan_to_num(tp - _shift_forward(tp))
+    pos_flow = np.where(delta < 0, 0.0, money_flow)
+    neg_flow = np.where(delta >= 0, 0.0, money_flow)
+    ratio = rolling_sum(pos_flow, MFI_WINDOW) / (
+        rolling_sum(neg_flow, MFI_WINDOW) + 1e-12
+    )
+    mfi = 1.0 - 1.0 / (1 + ratio)
+    mfi[:MFI_WINDOW] = 0.5
+    return mfi
+
+
+def compute_indicators(
+    data: Annotated[pd.DataFrame, "price history with Close/High/Low/Volume columns"],
+    indicators: Annotated[Iterable[str], "names from SUPPORTED_INDICATORS"],
+) -> Dict[str, np.ndarray]:
+    """Compute the requested indicators over the whole price history."""
+    columns = {str(c).lower(): c for c in data.columns}
+
+    def col(name):
+        return data[columns[name]].to_numpy(dtype=float)
+
+    close = col("close")
+    if len(close) == 0:
+        return {indicator: np.empty(0) for indicator in indicators}
+
+    results: Dict[str, np.ndarray] = {}
+    for indicator in indicators:
+        if indicator in results:
+            continue
+        if indicator == "close_50_sma":
+            results[indicator] = sma(close, 50)
+        elif indicator == "close_200_sma":
+            results[indicator] = sma(close, 200)
+        elif indicator == "close_10_ema":
+            results[indicator] = ema(close, 10)
+        elif indicator in ("macd", "macds", "macdh"):
+            results["macd"], results["macds"], results["macdh"] = _macd(close)
+        elif indicator == "rsi":
+            results[indicator] = _rsi(close)
+        elif indicator in ("boll", "boll_ub", "boll_lb"):
+            results["boll"], results["boll_ub"], results["boll_lb"] = _boll(close)
+        elif indicator == "atr":
+            results[indicator] = _atr(close, col("high"), col("low"))
+        elif indicator == "vwma":
+            results[indicator] = _vwma(close, col("high"), col("low"), col("volume"))
+        elif indicator == "mfi":
+            results[indicator] = _mfi(close, col("high"), col("low"), col("volume"))
+        else:
+            raise ValueError(f"Indicator {indicator} has no numpy kernel")
+    return {indicator: results[indicator] for indicator in indicators}
@@ -1,19 +1,25 @@
-from typing import Annotated, Dict
+from typing import Annotated, Dict, List, Optional
 from .reddit_utils import fetch_top_from_category
 from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .simfin_index import load_statement_index
+from .disk_cache import get_disk_cache
+from .openai_client import get_openai_client
+from .price_store import get_offline_price_data, select_dates
 from dateutil.relativedelta import relativedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+import hashlib
 import json
+import multiprocessing
 import os
+import threading
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
 import yfinance as yf
-from openai import OpenAI
-from .config import get_config, set_config, DATA_DIR
+from .config import get_config, set_config, use_config
 
 
 def get_finnhub_news(
@@ -40,7 +46,9 @@ def get_finnhub_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    result = get_data_in_range(ticker, before, curr_date, "news_data", DATA_DIR)
+    result = get_data_in_range(
+        ticker, before, curr_date, "news_data", get_config()["data_dir"]
+    )
 
     if len(result) == 0:
         return ""
@@ -58,6 +66,28 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+def _entry_key(entry: dict):
+    """Hashable key that is equal for entries that compare equal."""
+    key = tuple(sorted(entry.items()))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        # nested lists or dicts in the values
+        return json.dumps(entry, sort_keys=True)
+
+
+def _unique_entries(data: Dict[str, list]):
+    """Entries of all days in order, skipping repeats of an earlier entry."""
+    seen = set()
+    for entries in data.values():
+        for entry in entries:
+            key = _entry_key(entry)
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -79,18 +109,17 @@ def get_finnhub_company_insider_sentiment(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_senti", DATA_DIR)
+    data = get_data_in_range(
+        ticker, before, curr_date, "insider_senti", get_config()["data_dir"]
+    )
 
     if len(data) == 0:
         return ""
 
-    result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    result_str = "".join(
+        f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
+        for entry in _unique_entries(data)
+    )
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -120,19 +149,17 @@ def get_finnhub_company_insider_transactions(
     before = date_obj - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    data = get_data_in_range(ticker, before, curr_date, "insider_trans", DATA_DIR)
+    data = get_data_in_range(
+        ticker, before, curr_date, "insider_trans", get_config()["data_dir"]
+    )
 
     if len(data) == 0:
         return ""
 
-    result_str = ""
-
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    result_str = "".join(
+        f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+        for entry in _unique_entries(data)
+    )
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -150,7 +177,7 @@ def get_simfin_balance_sheet(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        get_config()["data_dir"],
         "fundamental_data",
         "simfin_data_all",
         "balance_sheet",
@@ -158,28 +185,16 @@ def get_simfin_balance_sheet(
         "us",
         f"us-balance-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest report of the ticker published on or before the current date
+    latest = load_statement_index(data_path).latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
-    latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
+    latest_balance_sheet = latest.drop("SimFinId")
 
     return (
         f"## {freq} balance sheet for {ticker} released on {str(latest_balance_sheet['Publish Date'])[0:10]}: \n"
@@ -197,7 +212,7 @@ def get_simfin_cashflow(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        get_config()["data_dir"],
         "fundamental_data",
         "simfin_data_all",
         "cash_flow",
@@ -205,28 +220,16 @@ def get_simfin_cashflow(
         "us",
         f"us-cashflow-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest report of the ticker published on or before the current date
+    latest = load_statement_index(data_path).latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
-    latest_cash_flow = latest_cash_flow.drop("SimFinId")
+    latest_cash_flow = latest.drop("SimFinId")
 
     return (
         f"## {freq} cash flow statement for {ticker} released on {str(latest_cash_flow['Publish Date'])[0:10]}: \n"
@@ -244,7 +247,7 @@ def get_simfin_income_statements(
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
     data_path = os.path.join(
-        DATA_DIR,
+        get_config()["data_dir"],
         "fundamental_data",
         "simfin_data_all",
         "income_statements",
@@ -252,28 +255,16 @@ def get_simfin_income_statements(
         "us",
         f"us-income-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Latest report of the ticker published on or before the current date
+    latest = load_statement_index(data_path).latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
-    latest_income = latest_income.drop("SimFinId")
+    latest_income = latest.drop("SimFinId")
 
     return (
         f"## {freq} income statement for {ticker} released on {str(latest_income['Publish Date'])[0:10]}: \n"
@@ -282,6 +273,11 @@ def get_simfin_income_statements(
     )
 
 
+def _is_past(curr_date):
+    """Whether a window ending on curr_date is closed, so its results are final."""
+    return curr_date < datetime.now().strftime("%Y-%m-%d")
+
+
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -293,7 +289,21 @@ def get_google_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    news_results = getNewsData(query, before, curr_date)
+    # historical windows never change, windows reaching today are refreshed;
+    # scrapes cut short by a failed page are not cached at all
+    cache = get_disk_cache()
+    cache_key = json.dumps([query, before, curr_date])
+    news_results = cache.get("google_news", cache_key)
+    if news_results is None:
+        news_results, complete = fetch_news(query, before, curr_date)
+        if complete:
+            is_final = news_results and _is_past(curr_date)
+            cache.set(
+                "google_news",
+                cache_key,
+                news_results,
+                ttl=None if is_final else get_config()["news_cache_ttl"],
+            )
 
     news_str = ""
 
@@ -326,26 +336,16 @@ def get_reddit_global_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # fetch every day from before to start_date in one pass
+    posts = fetch_top_from_category(
+        "global_news",
+        before,
+        max_limit_per_day,
+        data_path=os.path.join(get_config()["data_dir"], "reddit_data"),
+        end_date=start_date.strftime("%Y-%m-%d"),
+        max_workers=get_config()["reddit_scan_workers"],
+    )
+    curr_date = start_date + relativedelta(days=1)
 
     if len(posts) == 0:
         return ""
@@ -380,31 +380,17 @@ def get_reddit_company_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
+    # fetch every day from before to start_date in one pass
+    posts = fetch_top_from_category(
+        "company_news",
+        before,
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(get_config()["data_dir"], "reddit_data"),
+        end_date=start_date.strftime("%Y-%m-%d"),
+        max_workers=get_config()["reddit_scan_workers"],
     )
-
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
+    curr_date = start_date + relativedelta(days=1)
 
     if len(posts) == 0:
         return ""
@@ -511,39 +497,36 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # compute the indicator once over the full series and slice the window
+    try:
+        ind_values = StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicator,
+            before.strftime("%Y-%m-%d"),
+            end_date,
+            os.path.join(get_config()["data_dir"], "market_data", "price_data"),
+            online=online,
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
+        missing_value = "N/A: Not a trading day (weekend or holiday)"
+    except Exception as e:
+        if not online:
+            raise
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
+        )
+        ind_values = {}
+        missing_value = ""
 
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+    ind_string = ""
+    while curr_date >= before:
+        date_str = curr_date.strftime("%Y-%m-%d")
+        if date_str in ind_values:
+            ind_string += f"{date_str}: {ind_values[date_str]}\n"
+        elif online:
+            # online reports list every calendar day, offline only trading days
+            ind_string += f"{date_str}: {missing_value}\n"
 
-            curr_date = curr_date - relativedelta(days=1)
+        curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
@@ -572,7 +555,7 @@ def get_stockstats_indicator(
             symbol,
             indicator,
             curr_date,
-            os.path.join(DATA_DIR, "market_data", "price_data"),
+            os.path.join(get_config()["data_dir"], "market_data", "price_data"),
             online=online,
         )
     except Exception as e:
@@ -584,6 +567,86 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+def _symbol_indicator_rows(symbol, indicators, dates, price_dir, online, config):
+    """Worker for get_stockstats_indicators_batch: all rows of one symbol."""
+    date_index = pd.DatetimeIndex(dates)
+
+    rows = []
+    for indicator in indicators:
+        try:
+            with use_config(config):
+                values = StockstatsUtils.get_indicator_series(
+                    symbol, indicator, price_dir, online
+                )
+        except Exception as e:
+            print(
+                f"Error getting stockstats indicator data for {symbol} indicator {indicator}: {e}"
+            )
+            continue
+
+        values = values[~values.index.duplicated()].reindex(date_index)
+        for date, value in zip(dates, values.values):
+            rows.append((symbol, date, indicator, value))
+    return rows
+
+
+# Worker processes of get_stockstats_indicators_batch, shared by all calls
+_indicator_pool = None
+_indicator_pool_workers = None
+_indicator_pool_lock = threading.Lock()
+
+
+def _get_indicator_pool(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    global _indicator_pool, _indicator_pool_workers
+    with _indicator_pool_lock:
+        if _indicator_pool is None or _indicator_pool_workers != max_workers:
+            if _indicator_pool is not None:
+                _indicator_pool.shutdown(wait=False)
+            # calls come from tool threads, forking there would copy a
+            # multithreaded process
+            _indicator_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _indicator_pool_workers = max_workers
+        return _indicator_pool
+
+
+def get_stockstats_indicators_batch(
+    symbols: Annotated[List[str], "ticker symbols of the companies"],
+    indicators: Annotated[List[str], "technical indicators to compute"],
+    dates: Annotated[List[str], "trading dates in yyyy-mm-dd format"],
+    online: Annotated[bool, "to fetch data online or offline"] = False,
+    max_workers: Annotated[
+        Optional[int], "worker processes, defaults to the number of CPUs"
+    ] = None,
+) -> pd.DataFrame:
+    """
+    Retrieve indicator values for many symbols, indicators and dates at once.
+    Symbols are computed in parallel in a shared pool of spawned worker
+    processes, each reading the precomputed indicator matrix of its symbol;
+    scripts calling it need an `if __name__ == "__main__"` guard.
+    Returns:
+        pd.DataFrame: tidy frame with columns symbol, date, indicator and value.
+        Days without a trading session have a NaN value.
+    """
+    dates = [datetime.strptime(d, "%Y-%m-%d").strftime("%Y-%m-%d") for d in dates]
+    config = get_config()
+    price_dir = os.path.join(config["data_dir"], "market_data", "price_data")
+    args = [(symbol, indicators, dates, price_dir, online, config) for symbol in symbols]
+
+    if len(symbols) <= 1 or max_workers == 1:
+        results = [_symbol_indicator_rows(*arg) for arg in args]
+    else:
+        pool = _get_indicator_pool(max_workers)
+        results = list(pool.map(_symbol_indicator_rows, *zip(*args)))
+
+    return pd.DataFrame(
+        [row for rows in results for row in rows],
+        columns=["symbol", "date", "indicator", "value"],
+    )
+
+
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -595,23 +658,14 @@ def get_YFin_data_window(
     start_date = before.strftime("%Y-%m-%d")
 
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+    data = get_offline_price_data(
+        symbol, os.path.join(get_config()["data_dir"], "market_data", "price_data")
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    # Filter data between the start and end dates (inclusive), keeping the
+    # original row numbers in the printed frame
+    mask = select_dates(data, start_date, curr_date)
+    filtered_data = data[mask].set_axis(np.flatnonzero(mask))
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -673,11 +727,8 @@ def get_YFin_data(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+    data = get_offline_price_data(
+        symbol, os.path.join(get_config()["data_dir"], "market_data", "price_data")
     )
 
     if end_date > "2025-03-25":
@@ -685,16 +736,8 @@ def get_YFin_data(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = data[select_dates(data, start_date, end_date)]
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -702,106 +745,82 @@ def get_YFin_data(
     return filtered_data
 
 
-def get_stock_news_openai(ticker, curr_date):
+def _openai_web_search(prompt, is_final=False):
+    """
+    Answer a prompt with the web search tool of the quick thinking model.
+    Responses are cached on disk under a hash of the model, the prompt and the
+    request parameters, so repeated runs over the same date window reuse them.
+    Answers about a closed window (is_final) never expire, answers about a
+    window reaching today are refreshed after news_cache_ttl.
+    """
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
-
-    response = client.responses.create(
-        model=config["quick_think_llm"],
-        input=[
+    request = {
+        "model": config["quick_think_llm"],
+        "input": [
             {
                 "role": "system",
                 "content": [
                     {
                         "type": "input_text",
-                        "text": f"Can you search Social Media for {ticker} from 7 days before {curr_date} to {curr_date}? Make sure you only get the data posted during that period.",
+                        "text": prompt,
                     }
                 ],
             }
         ],
-        text={"format": {"type": "text"}},
-        reasoning={},
-        tools=[
+        "text": {"format": {"type": "text"}},
+        "reasoning": {},
+        "tools": [
             {
                 "type": "web_search_preview",
                 "user_location": {"type": "approximate"},
                 "search_context_size": "low",
             }
         ],
-        temperature=1,
-        max_output_tokens=4096,
-        top_p=1,
-        store=True,
-    )
+        "temperature": 1,
+        "max_output_tokens": 4096,
+        "top_p": 1,
+    }
 
-    return response.output[1].content[0].text
+    cache = get_disk_cache() if config["openai_response_cache"] else None
+    cache_key = hashlib.sha256(
+        json.dumps([config["backend_url"], request], sort_keys=True).encode()
+    ).hexdigest()
+    if cache is not None:
+        cached = cache.get("openai_web_search", cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_openai_client(config["backend_url"])
+    response = client.responses.create(**request, store=True)
+    result = response.output[1].content[0].text
+
+    if cache is not None:
+        cache.set(
+            "openai_web_search",
+            cache_key,
+            result,
+            ttl=None if is_final else config["news_cache_ttl"],
+        )
+    return result
 
 
-def get_global_news_openai(curr_date):
-    config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
 
-    response = client.responses.create(
-        model=config["quick_think_llm"],
-        input=[
-            {
-                "role": "system",
-                "content": [
-                    {
-                        "type": "input_text",
-                        "text": f"Can you search global or macroeconomics news from 7 days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period.",
-                    }
-                ],
-            }
-        ],
-        text={"format": {"type": "text"}},
-        reasoning={},
-        tools=[
-            {
-                "type": "web_search_preview",
-                "user_location": {"type": "approximate"},
-                "search_context_size": "low",
-            }
-        ],
-        temperature=1,
-        max_output_tokens=4096,
-        top_p=1,
-        store=True,
+def get_stock_news_openai(ticker, curr_date):
+    return _openai_web_search(
+        f"Can you search Social Media for {ticker} from 7 days before {curr_date} to {curr_date}? Make sure you only get the data posted during that period.",
+        is_final=_is_past(curr_date),
     )
 
-    return response.output[1].content[0].text
 
+def get_global_news_openai(curr_date):
+    return _openai_web_search(
+        f"Can you search global or macroeconomics news from 7 days before {curr_date} to {curr_date} that would be informative for trading purposes? Make sure you only get the data posted during that period.",
+        is_final=_is_past(curr_date),
+    )
 
-def get_fundamentals_openai(ticker, curr_date):
-    config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
 
-    response = client.responses.create(
-        model=config["quick_think_llm"],
-        input=[
-            {
-                "role": "system",
-                "content": [
-                    {
-                        "type": "input_text",
-                        "text": f"Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc",
-                    }
-                ],
-            }
-        ],
-        text={"format": {"type": "text"}},
-        reasoning={},
-        tools=[
-            {
-                "type": "web_search_preview",
-                "user_location": {"type": "approximate"},
-                "search_context_size": "low",
-            }
-        ],
-        temperature=1,
-        max_output_tokens=4096,
-        top_p=1,
-        store=True,
+def get_fundamentals_openai(ticker, curr_date):
+    return _openai_web_search(
+        f"Can you search Fundamental for discussions on {ticker} during of the month before {curr_date} to the month of {curr_date}. Make sure you only get the data posted during that period. List as a table, with PE/PS/Cash flow/ etc",
+        is_final=_is_past(curr_date),
     )
-
-    return response.output[1].content[0].text
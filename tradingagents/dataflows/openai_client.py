@@ -0,0 +1,31 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from openai import DefaultHttpxClient, OpenAI
+
+_clients: Dict[Tuple[Optional[str], Optional[str]], OpenAI] = {}
+_http_client: Optional[DefaultHttpxClient] = None
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(
+    base_url: Optional[str] = None, api_key: Optional[str] = None
+) -> OpenAI:
+    """Shared OpenAI client of an endpoint and key.
+
+    Clients are created once per (base_url, api_key) and all of them send their
+    requests through one HTTP connection pool, so repeated tool calls reuse
+    open connections. A None api_key is resolved from OPENAI_API_KEY.
+    """
+    global _http_client
+    key = (base_url, api_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            if _http_client is None:
+                _http_client = DefaultHttpxClient()
+            client = OpenAI(
+                base_url=base_url, api_key=api_key, http_client=_http_client
+            )
+            _clients[key] = client
+        return client
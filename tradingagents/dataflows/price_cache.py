@@ -0,0 +1,236 @@
+"""Columnar on-disk storage for Yahoo Finance price history.
+
+Price frames are stored with their trading dates as a typed DatetimeIndex so
+that loading them needs no CSV or date parsing. Parquet is used when pyarrow
+is installed; otherwise frames fall back to pandas pickles, which keep the
+dtypes just as well.
+"""
+
+import glob
+import json
+import os
+import tempfile
+import threading
+from typing import Annotated, Callable, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+try:
+    import pyarrow  # noqa: F401
+
+    CACHE_FORMAT = "parquet"
+    CACHE_SUFFIX = ".parquet"
+except ImportError:
+    CACHE_FORMAT = "pickle"
+    CACHE_SUFFIX = ".pkl"
+
+
+def index_by_date(data: pd.DataFrame) -> pd.DataFrame:
+    """Index a price frame by the YYYY-mm-dd part of its Date column."""
+    if not isinstance(data.index, pd.DatetimeIndex):
+        data.index = pd.DatetimeIndex(
+            pd.to_datetime(data["Date"].astype(str).str[:10])
+        )
+    return data
+
+
+def columnar_path(path: Annotated[str, "path of a price csv file"]) -> str:
+    """Path of the columnar cache file that stands in for a csv file."""
+    return os.path.splitext(path)[0] + CACHE_SUFFIX
+
+
+def replace_file(
+    path: Annotated[str, "file to write"],
+    write: Annotated[Callable[[str], None], "writes the content to a given path"],
+):
+    """Write a file through a temporary file next to it, then move it in place.
+
+    Every write gets its own temporary file, so concurrent writers in threads
+    or processes never mix their output and readers never see a partial file.
+    """
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path) or ".",
+        prefix=f"{os.path.basename(path)}.",
+        suffix=".tmp",
+        delete=False,
+    ) as f:
+        tmp_path = f.name
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_price_frame(
+    data: Annotated[pd.DataFrame, "price history with a Date column"],
+    path: Annotated[str, "destination, the suffix is replaced by the cache format"],
+) -> str:
+    """Write a price frame in the columnar cache format and return its path."""
+    target = columnar_path(path)
+    data = index_by_date(data.copy())
+
+    replace_file(
+        target, data.to_parquet if CACHE_FORMAT == "parquet" else data.to_pickle
+    )
+    return target
+
+
+def read_price_frame(path: Annotated[str, "path of a price csv file"]) -> pd.DataFrame:
+    """Read a price file, preferring its columnar cache when it is up to date.
+
+    Raises FileNotFoundError when neither the columnar file nor the csv exists.
+    """
+    target = columnar_path(path)
+    if os.path.exists(target) and (
+        not os.path.exists(path) or os.path.getmtime(target) >= os.path.getmtime(path)
+    ):
+        if CACHE_FORMAT == "parquet":
+            return pd.read_parquet(target)
+        return pd.read_pickle(target)
+
+    return pd.read_csv(path)
+
+
+def migrate_price_csvs(
+    directories: Annotated[Iterable[str], "directories holding YFin price csv files"],
+    remove_csv: Annotated[bool, "delete each csv once it has been converted"] = False,
+) -> List[str]:
+    """Convert every YFin price csv in the directories to the columnar format.
+
+    Files whose columnar copy is already up to date are skipped. Returns the
+    paths of the columnar files that were written.
+    """
+    written = []
+    for directory in directories:
+        for csv_path in sorted(glob.glob(os.path.join(directory, "*-YFin-data-*.csv"))):
+            target = columnar_path(csv_path)
+            if not (
+                os.path.exists(target)
+                and os.path.getmtime(target) >= os.path.getmtime(csv_path)
+            ):
+                written.append(write_price_frame(pd.read_csv(csv_path), csv_path))
+            if remove_csv:
+                os.remove(csv_path)
+    return written
+
+
+def migrate_configured_price_data(
+    remove_csv: Annotated[bool, "delete each csv once it has been converted"] = False,
+) -> List[str]:
+    """Convert the online data cache and the offline price_data files in bulk."""
+    config = get_config()
+    directories = [
+        config["data_cache_dir"],
+        os.path.join(config["data_dir"], "market_data", "price_data"),
+    ]
+    return migrate_price_csvs(
+        [d for d in directories if os.path.isdir(d)], remove_csv=remove_csv
+    )
+
+
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+
+def _symbol_lock(symbol: str) -> threading.Lock:
+    with _symbol_locks_guard:
+        return _symbol_locks.setdefault(symbol, threading.Lock())
+
+
+def _download_yfin(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    data = yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    if data.empty:
+        # no bars in the range: only holidays, or an unknown symbol
+        return pd.DataFrame(columns=data.columns, index=pd.DatetimeIndex([]))
+    return index_by_date(data.reset_index())
+
+
+def load_yfin_history(
+    symbol: Annotated[str, "ticker symbol"],
+    cache_dir: Annotated[str, "directory of the online data cache"],
+    start_date: Annotated[str, "first date needed, YYYY-mm-dd"],
+    end_date: Annotated[str, "exclusive end date, YYYY-mm-dd"],
+) -> pd.DataFrame:
+    """Daily Yahoo Finance history from an incremental per-symbol cache.
+
+    The cache keeps one columnar file per symbol plus a small json file that
+    records the first date, the last cached bar and the end date of the last
+    download. Only the bars after the last cached one are requested. When the
+    overlapping bar no longer matches (a split or dividend changed the
+    adjusted prices) the full history is downloaded again. Files from the old
+    one-file-per-day cache are removed once the store is written.
+    """
+    base = os.path.join(cache_dir, f"{symbol}-YFin-data")
+    meta_path = base + ".json"
+
+    with _symbol_lock(symbol):
+        meta = None
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+
+        data = None
+        if meta is not None and meta["start_date"] <= start_date:
+            try:
+                data = read_price_frame(base + ".csv")
+            except FileNotFoundError:
+                data = None
+
+        changed = True
+        if data is None or data.empty:
+            data = _download_yfin(symbol, start_date, end_date)
+            first_date = start_date
+        else:
+            first_date = meta["start_date"]
+            if meta["fetched_through"] >= end_date:
+                changed = False
+            else:
+                # re-request the last cached bar to detect price adjustments
+                tail = _download_yfin(symbol, meta["last_bar"], end_date)
+                overlap = tail.index.intersection(data.index[-1:])
+                if len(overlap) and not np.allclose(
+                    tail.loc[overlap, "Close"].values,
+                    data.loc[overlap, "Close"].values,
+                    rtol=1e-6,
+                ):
+                    data = _download_yfin(symbol, start_date, end_date)
+                    first_date = start_date
+                elif not tail.empty:
+                    data = pd.concat([data, tail])
+                    data = data[~data.index.duplicated(keep="last")].sort_index()
+
+        if changed:
+            write_price_frame(data, base + ".csv")
+            meta = {
+                "start_date": first_date,
+                "last_bar": (
+                    data.index[-1].strftime("%Y-%m-%d") if len(data) else first_date
+                ),
+                "fetched_through": end_date,
+            }
+
+            def write_meta(path):
+                with open(path, "w") as f:
+                    json.dump(meta, f)
+
+            replace_file(meta_path, write_meta)
+
+            # drop the superseded one-file-per-day caches of this symbol
+            for stale in glob.glob(f"{base}-*-*"):
+                os.remove(stale)
+
+    return data[data.index >= pd.Timestamp(start_date)]
@@ -0,0 +1,181 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Annotated, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .price_cache import index_by_date, read_price_frame
+
+# Date range covered by the offline Yahoo Finance price files
+OFFLINE_PRICE_START = "2015-01-01"
+OFFLINE_PRICE_END = "2025-03-25"
+
+
+class PriceStore:
+    """Process-wide LRU cache of parsed price frames.
+
+    Frames are keyed by (symbol, source, start_date, end_date, location,
+    version) and indexed by a pre-parsed DatetimeIndex of the trading date. The least
+    recently used frames are evicted once the total in-memory size exceeds
+    ``max_bytes``. Cached frames are shared, so callers must not modify them.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._frames: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        self._total_bytes = 0
+        self._loading: Dict[Tuple, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        symbol: Annotated[str, "ticker symbol"],
+        source: Annotated[str, "where the prices come from, e.g. offline or yfinance"],
+        start_date: Annotated[str, "first date covered by the frame, YYYY-mm-dd"],
+        end_date: Annotated[str, "last date covered by the frame, YYYY-mm-dd"],
+        loader: Annotated[Callable[[], pd.DataFrame], "loads the frame on a miss"],
+        location: Annotated[Optional[str], "file or directory the frame is read from"] = None,
+        version: Annotated[
+            Optional[str], "fingerprint of the inputs the frame is derived from"
+        ] = None,
+    ) -> pd.DataFrame:
+        """Return the cached frame for the key, calling ``loader`` on a miss."""
+        key = (symbol, source, start_date, end_date, location, version)
+
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # load outside the store lock so a slow read does not block other
+        # symbols, while concurrent misses of the same key wait for one load
+        with key_lock:
+            with self._lock:
+                frame = self._frames.get(key)
+                if frame is not None:
+                    self._frames.move_to_end(key)
+                    return frame
+
+            try:
+                frame = index_by_date(loader())
+                size = int(frame.memory_usage(deep=True).sum())
+
+                with self._lock:
+                    if size <= self.max_bytes:
+                        self._frames[key] = frame
+                        self._sizes[key] = size
+                        self._total_bytes += size
+                        self._evict()
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+        return frame
+
+    def invalidate(self, symbol: str, source: Optional[str] = None):
+        """Drop every cached frame of a symbol, optionally only for one source."""
+        with self._lock:
+            for key in list(self._frames):
+                if key[0] == symbol and (source is None or key[1] == source):
+                    self._remove(key)
+
+    def resize(self, max_bytes: int):
+        """Change the size budget, evicting frames at once when it shrinks."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._frames),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._frames:
+            self._remove(next(iter(self._frames)))
+            self.evictions += 1
+
+    def _remove(self, key):
+        del self._frames[key]
+        self._total_bytes -= self._sizes.pop(key)
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Get the shared price store, sized from the current configuration."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore(get_config()["price_cache_max_bytes"])
+    else:
+        max_bytes = get_config()["price_cache_max_bytes"]
+        if max_bytes != _store.max_bytes:
+            _store.resize(max_bytes)
+    return _store
+
+
+def offline_price_path(
+    symbol: Annotated[str, "ticker symbol"],
+    price_dir: Annotated[str, "directory holding the YFin price csv files"],
+) -> str:
+    """Path of the offline price csv file of a symbol."""
+    return os.path.join(
+        price_dir, f"{symbol}-YFin-data-{OFFLINE_PRICE_START}-{OFFLINE_PRICE_END}.csv"
+    )
+
+
+def get_offline_price_data(
+    symbol: Annotated[str, "ticker symbol"],
+    price_dir: Annotated[str, "directory holding the YFin price csv files"],
+) -> pd.DataFrame:
+    """Parsed offline price history of a symbol, read from disk at most once.
+
+    A columnar copy written by price_cache.migrate_price_csvs is used when present.
+    """
+    data_file = offline_price_path(symbol, price_dir)
+    return get_price_store().get(
+        symbol,
+        "offline",
+        OFFLINE_PRICE_START,
+        OFFLINE_PRICE_END,
+        lambda: read_price_frame(data_file),
+        location=data_file,
+    )
+
+
+def select_dates(
+    data: Annotated[pd.DataFrame, "frame returned by the price store"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+) -> np.ndarray:
+    """Boolean mask of the rows whose trading date is within [start_date, end_date]."""
+    return (data.index >= pd.Timestamp(start_date)) & (
+        data.index <= pd.Timestamp(end_date)
+    )
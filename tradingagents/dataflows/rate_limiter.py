@@ -0,0 +1,67 @@
+"""Token-bucket rate limiting for outbound requests.
+
+A bucket refills at ``rate`` tokens per second up to ``capacity``. Callers
+reserve tokens and wait until the reservation is due, so the bucket works the
+same from threads and from any event loop. Buckets for HTTP hosts are created
+from the ``host_rate_limits`` setting and shared across the process.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .config import get_config
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Take tokens and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, amount: float = 1.0):
+        time.sleep(self.reserve(amount))
+
+    async def acquire_async(self, amount: float = 1.0):
+        await asyncio.sleep(self.reserve(amount))
+
+
+_host_buckets: Dict[str, Tuple[Tuple[float, float], TokenBucket]] = {}
+_host_buckets_lock = threading.Lock()
+
+
+def get_host_limiter(url: str) -> Optional[TokenBucket]:
+    """Shared bucket of the host of a url, None when the host is not limited.
+
+    Limits are read from ``host_rate_limits``, a mapping of host name to
+    ``{"requests_per_second": ..., "burst": ...}``.
+    """
+    host = urlsplit(url).hostname or url
+    limit = get_config()["host_rate_limits"].get(host)
+    if limit is None:
+        return None
+
+    settings = (float(limit["requests_per_second"]), float(limit.get("burst", 1)))
+    with _host_buckets_lock:
+        cached = _host_buckets.get(host)
+        if cached is None or cached[0] != settings:
+            cached = (settings, TokenBucket(*settings))
+            _host_buckets[host] = cached
+        return cached[1]
@@ -1,8 +1,13 @@
+import heapq
+import multiprocessing
 import requests
+import threading
 import time
 import json
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from typing import Annotated
 import os
 import re
@@ -49,21 +54,265 @@ ticker_to_company = {
 }
 
 
+@lru_cache(maxsize=None)
+def _company_pattern(query: str) -> re.Pattern:
+    """One case-insensitive alternation of the company names and the ticker."""
+    # tickers missing from the map are matched by the ticker alone
+    search_terms = []
+    if query in ticker_to_company:
+        search_terms = ticker_to_company[query].split(" OR ")
+    search_terms.append(query)
+
+    return re.compile("|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE)
+
+
+def _mentions_company(parsed_line: dict, query: str) -> bool:
+    """Whether the title or the content of a post mentions the company (query)."""
+    pattern = _company_pattern(query)
+    return bool(
+        pattern.search(parsed_line["title"]) or pattern.search(parsed_line["selftext"])
+    )
+
+
+def _post_date(parsed_line: dict) -> str:
+    return datetime.utcfromtimestamp(parsed_line["created_utc"]).strftime("%Y-%m-%d")
+
+
+def index_path(data_path: str, category: str) -> str:
+    """Location of the index of a category, kept outside the category folder."""
+    return os.path.join(data_path, f"{category}.index.json")
+
+
+def _file_version(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime]
+
+
+def _index_subreddit_file(path: str, index_tickers: bool) -> dict:
+    """Byte offsets of the posts of one .jsonl file by day, and by ticker mention."""
+    days = {}
+    tickers = {}
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            # skip empty lines
+            if not line.strip():
+                continue
+
+            parsed_line = json.loads(line)
+            post_date = _post_date(parsed_line)
+            day_posts = days.setdefault(post_date, [])
+            if index_tickers:
+                for ticker in ticker_to_company:
+                    if _mentions_company(parsed_line, ticker):
+                        tickers.setdefault(post_date, {}).setdefault(
+                            ticker, []
+                        ).append(len(day_posts))
+            day_posts.append([line_offset, len(line)])
+
+    return {
+        "version": _file_version(path),
+        "days": days,
+        "tickers": tickers,
+        "indexed_tickers": list(ticker_to_company) if index_tickers else [],
+    }
+
+
+def build_reddit_index(
+    data_path: Annotated[str, "Path to the reddit data folder."],
+    categories: Annotated[
+        list, "Categories to index, all category folders by default."
+    ] = None,
+) -> list:
+    """
+    Build the offline index of the reddit posts of each category.
+
+    For every .jsonl file the index records the byte offset of each post by the
+    day it was created and, for company categories, which of the known tickers
+    each post mentions, so fetch_top_from_category only reads the matching
+    posts. Files that changed after indexing are scanned in full until the
+    index is rebuilt. Returns the paths of the written index files.
+    """
+    if categories is None:
+        categories = sorted(
+            entry
+            for entry in os.listdir(data_path)
+            if os.path.isdir(os.path.join(data_path, entry))
+        )
+
+    written = []
+    for category in categories:
+        category_path = os.path.join(data_path, category)
+        files = {
+            data_file: _index_subreddit_file(
+                os.path.join(category_path, data_file), "company" in category
+            )
+            for data_file in sorted(os.listdir(category_path))
+            if data_file.endswith(".jsonl")
+        }
+
+        path = index_path(data_path, category)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": files}, f)
+        os.replace(tmp_path, path)
+        with _loaded_indexes_lock:
+            _loaded_indexes.pop(path, None)
+        written.append(path)
+    return written
+
+
+# Loaded category indexes by path, together with the version they were loaded at
+_loaded_indexes = {}
+_loaded_indexes_lock = threading.Lock()
+
+
+def load_reddit_index(data_path: str, category: str) -> dict:
+    """Index of a category by file name, empty when the category is not indexed."""
+    path = index_path(data_path, category)
+    if not os.path.exists(path):
+        return {}
+
+    version = _file_version(path)
+    with _loaded_indexes_lock:
+        cached = _loaded_indexes.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with open(path, "r") as f:
+        files = json.load(f)["files"]
+
+    with _loaded_indexes_lock:
+        _loaded_indexes[path] = (version, files)
+    return files
+
+
+def _read_subreddit_posts(
+    path: str, dates: list, category: str, query: str, file_index: dict = None
+) -> dict:
+    """Posts of one subreddit file created on each of the dates, in file order."""
+    is_company_query = "company" in category and query
+    wanted = set(dates)
+
+    if file_index is None or file_index["version"] != _file_version(path):
+        # scan the file once, bucketing the posts of the wanted days
+        parsed_lines = {date: [] for date in dates}
+        with open(path, "rb") as f:
+            for line in f:
+                # skip empty lines
+                if not line.strip():
+                    continue
+                parsed_line = json.loads(line)
+                post_date = _post_date(parsed_line)
+                if post_date in wanted:
+                    parsed_lines[post_date].append(parsed_line)
+        mentions_checked = False
+    else:
+        mentions_checked = is_company_query and query in file_index["indexed_tickers"]
+        parsed_lines = {}
+        with open(path, "rb") as f:
+            for date in dates:
+                offsets = file_index["days"].get(date, [])
+                if mentions_checked:
+                    offsets = [
+                        offsets[i]
+                        for i in file_index["tickers"].get(date, {}).get(query, [])
+                    ]
+                parsed_lines[date] = []
+                for offset, length in offsets:
+                    f.seek(offset)
+                    parsed_lines[date].append(json.loads(f.read(length)))
+
+    posts = {}
+    for date in dates:
+        posts[date] = []
+        for parsed_line in parsed_lines[date]:
+            # if is company_news, check that the title or the content has the company's name (query) mentioned
+            if is_company_query and not mentions_checked:
+                if not _mentions_company(parsed_line, query):
+                    continue
+
+            posts[date].append(
+                {
+                    "title": parsed_line["title"],
+                    "content": parsed_line["selftext"],
+                    "url": parsed_line["url"],
+                    "upvotes": parsed_line["ups"],
+                    "posted_date": date,
+                }
+            )
+    return posts
+
+
+def _top_subreddit_posts(
+    path: str,
+    category: str,
+    dates: list,
+    query: str,
+    limit: int,
+    file_index: dict = None,
+) -> dict:
+    """Top posts by upvotes of each day in one subreddit file."""
+    posts_by_date = _read_subreddit_posts(path, dates, category, query, file_index)
+    return {
+        day: heapq.nlargest(limit, posts, key=lambda x: x["upvotes"])
+        for day, posts in posts_by_date.items()
+    }
+
+
+# Worker processes scanning unindexed subreddit files, shared by all calls
+_scan_pool = None
+_scan_pool_workers = 0
+_scan_pool_lock = threading.Lock()
+
+
+def _get_scan_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _scan_pool, _scan_pool_workers
+    with _scan_pool_lock:
+        if _scan_pool is None or _scan_pool_workers != max_workers:
+            if _scan_pool is not None:
+                _scan_pool.shutdown(wait=False)
+            # calls come from tool threads, forking there would copy a
+            # multithreaded process
+            _scan_pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _scan_pool_workers = max_workers
+        return _scan_pool
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
     date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
+    end_date: Annotated[
+        str, "Optional last date of a range of days starting at date."
+    ] = None,
+    max_workers: Annotated[
+        int, "Worker processes scanning the subreddit files, 1 scans in-process."
+    ] = 1,
 ):
-    base_path = data_path
+    """
+    Top posts by upvotes of each subreddit in a category.
 
-    all_content = []
+    With an end_date, every day from date to end_date is fetched in a single
+    pass over each file; the top posts are selected per day and per subreddit,
+    and returned ordered by day. Files covered by an up-to-date index only
+    have their matching posts read, in-process. With max_workers above 1 the
+    other files are scanned in a shared pool of worker processes. Results are
+    merged in file order.
+    """
+    base_path = data_path
 
     if max_limit < len(os.listdir(os.path.join(base_path, category))):
         raise ValueError(
@@ -74,62 +323,61 @@ def fetch_top_from_category(
         os.listdir(os.path.join(base_path, category))
     )
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
-
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+    dates = [date]
+    if end_date is not None:
+        curr_date = datetime.strptime(date, "%Y-%m-%d")
+        last_date = datetime.strptime(end_date, "%Y-%m-%d")
+        dates = []
+        while curr_date <= last_date:
+            dates.append(curr_date.strftime("%Y-%m-%d"))
+            curr_date += timedelta(days=1)
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    # check if data_file is a .jsonl file
+    data_files = [
+        data_file
+        for data_file in os.listdir(os.path.join(base_path, category))
+        if data_file.endswith(".jsonl")
+    ]
+    index = load_reddit_index(base_path, category)
+    results = {}
+    scans = []
+    for data_file in data_files:
+        path = os.path.join(base_path, category, data_file)
+        file_index = index.get(data_file)
+        if file_index is not None and file_index["version"] == _file_version(path):
+            results[data_file] = _top_subreddit_posts(
+                path, category, dates, query, limit_per_subreddit, file_index
+            )
+        else:
+            scans.append((data_file, path))
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+    if max_workers > 1 and len(scans) > 1:
+        pool = _get_scan_pool(max_workers)
+        futures = [
+            (
+                data_file,
+                pool.submit(
+                    _top_subreddit_posts,
+                    path,
+                    category,
+                    dates,
+                    query,
+                    limit_per_subreddit,
+                ),
+            )
+            for data_file, path in scans
+        ]
+        for data_file, future in futures:
+            results[data_file] = future.result()
+    else:
+        for data_file, path in scans:
+            results[data_file] = _top_subreddit_posts(
+                path, category, dates, query, limit_per_subreddit
+            )
 
-    return all_content
+    return [
+        post
+        for day in dates
+        for data_file in data_files
+        for post in results[data_file][day]
+    ]
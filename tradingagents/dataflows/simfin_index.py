@@ -0,0 +1,81 @@
+import os
+import threading
+from typing import Annotated, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class StatementIndex:
+    """One SimFin statement file, parsed once and indexed by ticker.
+
+    For every ticker the rows are kept sorted by publish date (ties in file
+    order), so the latest statement published on or before a date is found
+    with a binary search.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+        self.frame = df
+
+        published = df["Publish Date"].notna().to_numpy()
+        self._rows: Dict[str, Tuple[pd.DatetimeIndex, np.ndarray]] = {}
+        for ticker, positions in df.groupby("Ticker", sort=False).indices.items():
+            positions = positions[published[positions]]
+            if len(positions) == 0:
+                continue
+            dates = df["Publish Date"].iloc[positions]
+            order = np.lexsort((positions, dates.to_numpy()))
+            self._rows[ticker] = (
+                pd.DatetimeIndex(dates.iloc[order]),
+                positions[order],
+            )
+
+    def latest(
+        self,
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Latest statement published on or before curr_date, None if there is none."""
+        if ticker not in self._rows:
+            return None
+        dates, positions = self._rows[ticker]
+
+        curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+        end = dates.searchsorted(curr_date_dt, side="right")
+        if end == 0:
+            return None
+        # first row of the latest publish date, as idxmax would pick
+        first = dates.searchsorted(dates[end - 1], side="left")
+        return self.frame.iloc[positions[first]]
+
+
+# Loaded statement files by path, together with the (mtime, size) they were loaded at
+_indexes: Dict[str, Tuple[Tuple[float, int], StatementIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def load_statement_index(
+    data_path: Annotated[str, "path of a SimFin statement csv file"],
+) -> StatementIndex:
+    """Index of a statement file, built once per process and rebuilt when the file changes."""
+    stat = os.stat(data_path)
+    version = (stat.st_mtime, stat.st_size)
+
+    with _indexes_lock:
+        cached = _indexes.get(data_path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    index = StatementIndex(pd.read_csv(data_path, sep=";"))
+
+    with _indexes_lock:
+        _indexes[data_path] = (version, index)
+    return index
+
+
+def clear_simfin_cache():
+    with _indexes_lock:
+        _indexes.clear()
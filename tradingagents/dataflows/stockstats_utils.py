@@ -1,12 +1,233 @@
+import hashlib
+import json
+import numpy as np
 import pandas as pd
-import yfinance as yf
+from functools import lru_cache
+from importlib import metadata
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Dict
 import os
 from .config import get_config
+from .indicator_kernels import KERNELS_VERSION, compute_indicators
+from .price_cache import (
+    load_yfin_history,
+    read_price_frame,
+    replace_file,
+    write_price_frame,
+)
+from .price_store import get_offline_price_data, get_price_store, offline_price_path
+
+# Indicators offered to the market analyst, precomputed per symbol
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+
+@lru_cache(maxsize=None)
+def _backend_version(backend: str) -> str:
+    if backend == "numpy":
+        return f"numpy-kernels-{KERNELS_VERSION}"
+    try:
+        return f"stockstats-{metadata.version('stockstats')}"
+    except metadata.PackageNotFoundError:
+        return "stockstats"
+
+
+def _matrix_fingerprint(data: pd.DataFrame, backend: str) -> str:
+    """Hash of the price bars and the indicator engine a matrix is computed from."""
+    digest = hashlib.sha1(_backend_version(backend).encode())
+    digest.update(data.index.asi8.tobytes())
+    for column in data.columns:
+        values = data[column].to_numpy()
+        if values.dtype.kind in "biuf":
+            digest.update(str(column).encode())
+            digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
 
 
 class StockstatsUtils:
+    @staticmethod
+    def load_price_data(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.DataFrame:
+        """Load the full price history used for indicator calculation.
+
+        The returned frame keeps a "Date" column whose first ten characters
+        are the YYYY-mm-dd trading date. It is shared through the price store
+        and must not be modified.
+        """
+        if not online:
+            try:
+                return get_offline_price_data(symbol, data_dir)
+            except FileNotFoundError:
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+
+        # The online history covers the last 15 years up to today
+        today_date = pd.Timestamp.today()
+
+        end_date = today_date
+        start_date = today_date - pd.DateOffset(years=15)
+        start_date = start_date.strftime("%Y-%m-%d")
+        end_date = end_date.strftime("%Y-%m-%d")
+
+        # Get config and ensure cache directory exists
+        config = get_config()
+        os.makedirs(config["data_cache_dir"], exist_ok=True)
+
+        def load_data():
+            # a new day supersedes the frames cached for earlier days
+            get_price_store().invalidate(symbol, "yfinance")
+            data = load_yfin_history(
+                symbol, config["data_cache_dir"], start_date, end_date
+            ).copy()
+            data["Date"] = data["Date"].dt.strftime("%Y-%m-%d")
+            return data
+
+        return get_price_store().get(
+            symbol,
+            "yfinance",
+            start_date,
+            end_date,
+            load_data,
+            location=config["data_cache_dir"],
+        )
+
+    @staticmethod
+    def get_indicator_matrix(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.DataFrame:
+        """All supported indicators of a symbol as a date x indicator frame.
+
+        The matrix is computed in one pass, with stockstats or with the NumPy
+        kernels depending on the indicator_backend setting, persisted next to
+        the online price cache and kept in the price store. Matrices are
+        stored per price file and carry a fingerprint of the price bars and
+        the indicator engine; a matrix is rebuilt whenever its fingerprint no
+        longer matches.
+        """
+        data = StockstatsUtils.load_price_data(symbol, data_dir, online)
+        source = "yfinance" if online else "offline"
+        config = get_config()
+        backend = config["indicator_backend"]
+        cache_dir = config["data_cache_dir"]
+        price_file = (
+            os.path.join(cache_dir, f"{symbol}-YFin-data.csv")
+            if online
+            else offline_price_path(symbol, data_dir)
+        )
+        price_key = hashlib.sha1(os.path.abspath(price_file).encode()).hexdigest()[:12]
+        matrix_file = os.path.join(
+            cache_dir, f"{symbol}-YFin-indicators-{source}-{backend}-{price_key}.csv"
+        )
+        meta_file = os.path.splitext(matrix_file)[0] + ".json"
+        fingerprint = _matrix_fingerprint(data, backend)
+
+        def load_matrix():
+            try:
+                with open(meta_file, "r") as f:
+                    meta = json.load(f)
+                matrix = read_price_frame(matrix_file)
+                if (
+                    meta.get("fingerprint") == fingerprint
+                    and list(matrix.columns) == list(SUPPORTED_INDICATORS)
+                    and matrix.index.equals(data.index)
+                ):
+                    return matrix
+            except (FileNotFoundError, ValueError):
+                pass
+
+            if backend == "numpy":
+                values = compute_indicators(data, SUPPORTED_INDICATORS)
+            else:
+                df = wrap(data)
+                values = {
+                    indicator: df[indicator].values
+                    for indicator in SUPPORTED_INDICATORS
+                }
+            matrix = pd.DataFrame(values, index=data.index)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                write_price_frame(matrix, matrix_file)
+                # written after the matrix, a matrix without it is never reused
+                meta = {"price_file": price_file, "fingerprint": fingerprint}
+
+                def write_meta(path):
+                    with open(path, "w") as f:
+                        json.dump(meta, f)
+
+                replace_file(meta_file, write_meta)
+            except OSError as e:
+                print(f"Could not persist indicator matrix for {symbol}: {e}")
+            return matrix
+
+        first_bar, last_bar = (
+            (data.index[0].strftime("%Y-%m-%d"), data.index[-1].strftime("%Y-%m-%d"))
+            if len(data)
+            else ("", "")
+        )
+        return get_price_store().get(
+            symbol,
+            source,
+            first_bar,
+            last_bar,
+            load_matrix,
+            location=matrix_file,
+            version=fingerprint,
+        )
+
+    @staticmethod
+    def get_indicator_series(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """Indicator values over the full price history, indexed by trading date."""
+        if indicator in SUPPORTED_INDICATORS:
+            return StockstatsUtils.get_indicator_matrix(symbol, data_dir, online)[
+                indicator
+            ]
+
+        # other stockstats indicators are computed on demand
+        data = StockstatsUtils.load_price_data(symbol, data_dir, online)
+        return pd.Series(wrap(data)[indicator].values, index=data.index)
+
     @staticmethod
     def get_stock_stats(
         symbol: Annotated[str, "ticker symbol for the company"],
@@ -25,63 +246,51 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
-
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        values = StockstatsUtils.get_indicator_series(
+            symbol, indicator, data_dir, online
+        )
+        matching_rows = values[values.index == pd.Timestamp(curr_date)]
 
         if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
+            indicator_value = matching_rows.values[0]
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "first date of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "last date of the window, YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> Dict[str, object]:
+        """Indicator values for every trading day in [start_date, end_date].
+
+        The indicator is taken from the precomputed matrix (or computed once
+        over the full series) and the window is cut with a single date mask.
+        Returns a dict mapping YYYY-mm-dd to the indicator value on that
+        trading day.
+        """
+        values = StockstatsUtils.get_indicator_series(
+            symbol, indicator, data_dir, online
+        )
+
+        dates = values.index
+        # keep the first row of each date, as get_stock_stats does
+        mask = (
+            (dates >= pd.Timestamp(start_date))
+            & (dates <= pd.Timestamp(end_date))
+            & ~dates.duplicated()
+        )
+
+        return dict(zip(dates[mask].strftime("%Y-%m-%d"), values.values[mask]))
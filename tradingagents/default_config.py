@@ -8,6 +8,36 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # In-memory price cache budget shared by the market data tools
+    "price_cache_max_bytes": int(
+        os.getenv("PRICE_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+    ),
+    # Indicator engine: "stockstats" or the built-in "numpy" kernels
+    "indicator_backend": os.getenv("INDICATOR_BACKEND", "stockstats"),
+    # Worker processes scanning unindexed reddit dump files, 1 scans in-process;
+    # the workers are spawned, scripts need an `if __name__ == "__main__"` guard
+    "reddit_scan_workers": int(os.getenv("REDDIT_SCAN_WORKERS", "1")),
+    # Google News scraping: search endpoint and concurrent result pages
+    "google_news_url": os.getenv("GOOGLE_NEWS_URL", "https://www.google.com/search"),
+    "news_page_concurrency": int(os.getenv("NEWS_PAGE_CONCURRENCY", "3")),
+    # HTML parser of the result pages: "lxml" or "bs4"
+    "news_html_parser": os.getenv("NEWS_HTML_PARSER", "lxml"),
+    # Persistent cache of tool results; news windows reaching today expire
+    "disk_cache_path": os.getenv(
+        "DISK_CACHE_PATH",
+        os.path.join(
+            os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+            "dataflows/data_cache/tool_cache.sqlite3",
+        ),
+    ),
+    "news_cache_ttl": int(os.getenv("NEWS_CACHE_TTL", str(6 * 60 * 60))),
+    # Reuse web search responses of identical requests from the disk cache
+    "openai_response_cache": os.getenv("OPENAI_RESPONSE_CACHE", "True").lower()
+    == "true",
+    # Token-bucket limits of outbound requests per host
+    "host_rate_limits": {
+        "www.google.com": {"requests_per_second": 0.25, "burst": 3},
+    },
     # LLM settings - 支持自建API服务器
     "llm_provider": os.getenv("LLM_PROVIDER", "openai"),
     "deep_think_llm": os.getenv("DEEP_THINK_LLM", "gpt-4o-mini"),
@@ -17,10 +47,36 @@ DEFAULT_CONFIG = {
     "openai_api_key": os.getenv("OPENAI_API_KEY"),
     # 兼容性设置 - 支持其他API提供商
     "api_key": os.getenv("API_KEY", os.getenv("OPENAI_API_KEY")),
+    # Per-provider LLM limits, e.g.
+    # {"openai": {"requests_per_minute": 500, "tokens_per_minute": 200000}};
+    # requests are limited on every call, tokens when jobs are admitted by
+    # the batch runner
+    "llm_rate_limits": {},
+    # Batch runs: concurrent analyses, retries of a failed analysis with
+    # exponential backoff, and the token estimate of a job before any ran
+    "batch_max_concurrency": int(os.getenv("BATCH_MAX_CONCURRENCY", "4")),
+    "batch_max_retries": int(os.getenv("BATCH_MAX_RETRIES", "2")),
+    "batch_retry_backoff": float(os.getenv("BATCH_RETRY_BACKOFF", "5")),
+    "batch_tokens_per_job": int(os.getenv("BATCH_TOKENS_PER_JOB", "50000")),
     # Debate and discussion settings
     "max_debate_rounds": int(os.getenv("MAX_DEBATE_ROUNDS", "1")),
     "max_risk_discuss_rounds": int(os.getenv("MAX_RISK_DISCUSS_ROUNDS", "1")),
     "max_recur_limit": int(os.getenv("MAX_RECUR_LIMIT", "100")),
+    # Run the analysts as concurrent branches instead of one after another
+    "parallel_analysts": os.getenv("PARALLEL_ANALYSTS", "False").lower() == "true",
+    # Give each sequential analyst its own message history (always the case
+    # for parallel analysts)
+    "isolate_analyst_messages": os.getenv("ISOLATE_ANALYST_MESSAGES", "False").lower()
+    == "true",
+    # Analyst context: number of latest tool results sent in full (0 = all),
+    # older results are truncated to context_truncate_chars characters
+    "context_keep_tool_results": int(os.getenv("CONTEXT_KEEP_TOOL_RESULTS", "0")),
+    "context_truncate_chars": int(os.getenv("CONTEXT_TRUNCATE_CHARS", "500")),
     # Tool settings
     "online_tools": os.getenv("ONLINE_TOOLS", "True").lower() == "true",
+    # Concurrent tool calls per tool node, and worker processes for the
+    # indicator tools (0 runs them on the tool threads). Workers are spawned,
+    # so scripts using them need an if __name__ == "__main__" guard
+    "tool_max_workers": int(os.getenv("TOOL_MAX_WORKERS", "8")),
+    "tool_process_workers": int(os.getenv("TOOL_PROCESS_WORKERS", "0")),
 }
@@ -0,0 +1,159 @@
+# TradingAgents/graph/batch_runner.py
+
+import asyncio
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterable, List, NamedTuple, Optional
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+from tradingagents.dataflows.rate_limiter import TokenBucket
+
+from .trading_graph import TradingAgentsGraph
+
+# Token usage of the LLM calls made by the job running in the current task
+_job_usage: ContextVar[Optional[UsageMetadataCallbackHandler]] = ContextVar(
+    "tradingagents_job_usage", default=None
+)
+register_configure_hook(_job_usage, inheritable=True)
+
+
+class BatchJob(NamedTuple):
+    ticker: str
+    trade_date: str
+
+
+class BatchResult(NamedTuple):
+    ticker: str
+    trade_date: str
+    final_state: Optional[Dict[str, Any]]
+    decision: Optional[str]
+    error: Optional[Exception]
+    attempts: int
+    seconds: float
+    tokens: int
+
+
+class BatchRunner:
+    """Runs the analyses of many (ticker, date) jobs on one graph concurrently.
+
+    At most ``max_concurrency`` analyses run at a time. A failed analysis is
+    retried up to ``max_retries`` times, waiting ``retry_backoff`` seconds
+    doubled on every attempt (with jitter). LLM requests per minute are
+    limited by the graph's models (``llm_rate_limits``); the provider's tokens
+    per minute limit is applied when a job is admitted, charging the average
+    token usage of the finished jobs (``batch_tokens_per_job`` before any
+    finished) and the actual usage once a job is done.
+
+    Jobs share the graph, so ``curr_state`` of the graph holds the state of
+    the job that finished last.
+    """
+
+    def __init__(
+        self,
+        graph: TradingAgentsGraph,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        config = graph.config
+        self.graph = graph
+        self.max_concurrency = max_concurrency or config["batch_max_concurrency"]
+        self.max_retries = (
+            config["batch_max_retries"] if max_retries is None else max_retries
+        )
+        self.retry_backoff = (
+            config["batch_retry_backoff"] if retry_backoff is None else retry_backoff
+        )
+
+        provider = config.get("llm_provider", "openai").lower()
+        limit = config.get("llm_rate_limits", {}).get(provider, {})
+        tokens_per_minute = limit.get("tokens_per_minute")
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self.tokens_per_job = float(config["batch_tokens_per_job"])
+        self._finished_tokens: List[int] = []
+
+    def run(self, jobs: Iterable[BatchJob]) -> List[BatchResult]:
+        """Run all jobs and return their results in job order."""
+        return asyncio.run(self.arun(jobs))
+
+    async def arun(self, jobs: Iterable[BatchJob]) -> List[BatchResult]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self._run_job(BatchJob(*job), semaphore) for job in jobs)
+        )
+
+    async def stream(self, jobs: Iterable[BatchJob]) -> AsyncIterator[BatchResult]:
+        """Run all jobs and yield every result as soon as its job is done."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._run_job(BatchJob(*job), semaphore))
+            for job in jobs
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _run_job(
+        self, job: BatchJob, semaphore: asyncio.Semaphore
+    ) -> BatchResult:
+        async with semaphore:
+            start = time.perf_counter()
+            tokens = 0
+            for attempt in range(1, self.max_retries + 2):
+                estimate = self._estimate_tokens()
+                if self.token_bucket is not None:
+                    await self.token_bucket.acquire_async(estimate)
+
+                usage = UsageMetadataCallbackHandler()
+                _job_usage.set(usage)
+                try:
+                    final_state, decision = await self.graph.apropagate(
+                        job.ticker, job.trade_date
+                    )
+                    error = None
+                except Exception as e:
+                    final_state, decision, error = None, None, e
+                finally:
+                    _job_usage.set(None)
+
+                used = sum(
+                    item.get("total_tokens", 0) for item in usage.usage_metadata.values()
+                )
+                tokens += used
+                if self.token_bucket is not None and used > estimate:
+                    # the extra tokens delay the next admissions
+                    self.token_bucket.reserve(used - estimate)
+
+                if error is None:
+                    if used:
+                        self._finished_tokens.append(used)
+                    break
+                if attempt <= self.max_retries:
+                    delay = self.retry_backoff * 2 ** (attempt - 1)
+                    await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+            return BatchResult(
+                ticker=job.ticker,
+                trade_date=job.trade_date,
+                final_state=final_state,
+                decision=decision,
+                error=error,
+                attempts=attempt,
+                seconds=time.perf_counter() - start,
+                tokens=tokens,
+            )
+
+    def _estimate_tokens(self) -> float:
+        if not self._finished_tokens:
+            return self.tokens_per_job
+        return sum(self._finished_tokens) / len(self._finished_tokens)
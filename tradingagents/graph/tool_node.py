@@ -0,0 +1,137 @@
+# TradingAgents/graph/tool_node.py
+
+import asyncio
+import pickle
+import threading
+import time
+import weakref
+from collections import defaultdict
+from concurrent.futures import BrokenExecutor, Executor
+from typing import Any, Dict, Iterable, List, Optional
+
+from langchain_core.messages import ToolMessage
+from langchain_core.runnables.config import patch_config
+from langgraph.prebuilt import ToolNode
+from langgraph.prebuilt.tool_node import _handle_tool_error, _infer_handled_types
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.dataflows.config import get_config, use_config
+
+
+def _invoke_toolkit_tool(name: str, args: Dict[str, Any], config: Dict) -> Any:
+    """Run a Toolkit tool in a worker process with the caller's configuration."""
+    with use_config(config):
+        return getattr(Toolkit, name).invoke(args)
+
+
+class ConcurrentToolNode(ToolNode):
+    """ToolNode that runs the tool calls of one message concurrently.
+
+    Calls share a thread pool of at most ``max_workers`` threads (context
+    variables are copied into each thread). Run asynchronously, at most
+    ``max_workers`` calls of the node run at a time per event loop, across
+    all graph runs on that loop. Calls to the tools named in
+    ``process_tools`` are sent to ``process_pool`` instead, for CPU-bound
+    tools; they only run in-thread when the pool is broken or cannot pickle
+    the call. The wall time of every call is recorded per tool in
+    ``timings``.
+    """
+
+    def __init__(
+        self,
+        tools,
+        *,
+        max_workers: Optional[int] = None,
+        process_tools: Iterable[str] = (),
+        process_pool: Optional[Executor] = None,
+        **kwargs,
+    ):
+        super().__init__(tools, **kwargs)
+        self.max_workers = max_workers
+        self.process_tools = set(process_tools) if process_pool is not None else set()
+        self.process_pool = process_pool
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        # asyncio semaphores are bound to the loop they are first used on
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _func(self, input, config, *, store):
+        if self.max_workers is not None:
+            config = patch_config(config, max_concurrency=self.max_workers)
+        return super()._func(input, config, store=store)
+
+    def _run_one(self, call, input_type, config):
+        start = time.perf_counter()
+        try:
+            if call["name"] in self.process_tools:
+                message = self._run_in_process(call)
+                if message is not None:
+                    return message
+            return super()._run_one(call, input_type, config)
+        finally:
+            self._record(call["name"], time.perf_counter() - start)
+
+    async def _arun_one(self, call, input_type, config):
+        if self.max_workers is None:
+            return await self._arun_one_timed(call, input_type, config)
+        async with self._semaphore():
+            return await self._arun_one_timed(call, input_type, config)
+
+    async def _arun_one_timed(self, call, input_type, config):
+        start = time.perf_counter()
+        try:
+            if call["name"] in self.process_tools:
+                message = await asyncio.to_thread(self._run_in_process, call)
+                if message is not None:
+                    return message
+            return await super()._arun_one(call, input_type, config)
+        finally:
+            self._record(call["name"], time.perf_counter() - start)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_workers)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    def _run_in_process(self, call) -> Optional[ToolMessage]:
+        if self._validate_tool_call(call):
+            return None
+        try:
+            content = self.process_pool.submit(
+                _invoke_toolkit_tool, call["name"], call["args"], get_config()
+            ).result()
+        except (BrokenExecutor, pickle.PicklingError):
+            # the pool could not run the call, run it in-thread instead
+            return None
+        except Exception as e:
+            return self._error_message(call, e)
+        return ToolMessage(
+            content=content if isinstance(content, (str, list)) else str(content),
+            name=call["name"],
+            tool_call_id=call["id"],
+        )
+
+    def _error_message(self, call, error: Exception) -> ToolMessage:
+        """Report a failed call the way ToolNode reports errors of its tools."""
+        if isinstance(self.handle_tool_errors, tuple):
+            handled_types: tuple = self.handle_tool_errors
+        elif callable(self.handle_tool_errors):
+            handled_types = _infer_handled_types(self.handle_tool_errors)
+        else:
+            handled_types = (Exception,)
+        if not self.handle_tool_errors or not isinstance(error, handled_types):
+            raise error
+        return ToolMessage(
+            content=_handle_tool_error(error, flag=self.handle_tool_errors),
+            name=call["name"],
+            tool_call_id=call["id"],
+            status="error",
+        )
+
+    def _record(self, name: str, seconds: float):
+        with self._lock:
+            self.timings[name].append(seconds)
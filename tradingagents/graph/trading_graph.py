@@ -1,15 +1,22 @@
 # TradingAgents/graph/trading_graph.py
 
+import asyncio
+import multiprocessing
 import os
+import threading
+import weakref
 from pathlib import Path
 import json
 from datetime import date
 from typing import Dict, Any, Tuple, List, Optional
 
+from langchain_core.rate_limiters import InMemoryRateLimiter
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from concurrent.futures import ProcessPoolExecutor
+
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
@@ -20,13 +27,47 @@ from tradingagents.agents.utils.agent_states import (
     InvestDebateState,
     RiskDebateState,
 )
-from tradingagents.dataflows.interface import set_config
+from tradingagents.dataflows.interface import set_config, use_config
 
 from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .tool_node import ConcurrentToolNode
+
+
+# Request limiters of the LLM providers, shared by all graphs in the process
+_llm_rate_limiters: Dict[str, Tuple[Tuple[float, float], InMemoryRateLimiter]] = {}
+_llm_rate_limiters_lock = threading.Lock()
+
+
+def get_llm_rate_limiter(
+    provider: str, config: Dict[str, Any]
+) -> Optional[InMemoryRateLimiter]:
+    """Shared request limiter of a provider, None when it is not limited.
+
+    Limits are read from ``llm_rate_limits``, a mapping of provider name to
+    ``{"requests_per_minute": ..., "burst": ...}``.
+    """
+    limit = config.get("llm_rate_limits", {}).get(provider, {})
+    if not limit.get("requests_per_minute"):
+        return None
+
+    settings = (float(limit["requests_per_minute"]), float(limit.get("burst", 1)))
+    with _llm_rate_limiters_lock:
+        cached = _llm_rate_limiters.get(provider)
+        if cached is None or cached[0] != settings:
+            cached = (
+                settings,
+                InMemoryRateLimiter(
+                    requests_per_second=settings[0] / 60,
+                    check_every_n_seconds=0.1,
+                    max_bucket_size=settings[1],
+                ),
+            )
+            _llm_rate_limiters[provider] = cached
+        return cached[1]
 
 
 class TradingAgentsGraph:
@@ -48,7 +89,8 @@ class TradingAgentsGraph:
         self.debug = debug
         self.config = config or DEFAULT_CONFIG.copy()
 
-        # Update the interface's config
+        # Process-wide default for direct dataflow calls, runs use self.config
+        # through use_config
         set_config(self.config)
 
         # Create necessary directories
@@ -95,9 +137,14 @@ class TradingAgentsGraph:
         self.curr_state = None
         self.ticker = None
         self.log_states_dict = {}  # date to full state dict
+        self._log_lock = threading.Lock()  # concurrent apropagate runs log in threads
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            self.config["parallel_analysts"],
+            self.config["isolate_analyst_messages"],
+        )
 
     def _initialize_llms(self):
         """Initialize LLMs based on provider configuration with support for custom endpoints."""
@@ -107,6 +154,9 @@ class TradingAgentsGraph:
         
         # 构建LLM初始化参数
         llm_kwargs = {}
+        rate_limiter = get_llm_rate_limiter(provider, self.config)
+        if rate_limiter is not None:
+            llm_kwargs["rate_limiter"] = rate_limiter
         
         if provider in ["openai", "ollama", "openrouter"] or base_url != "https://api.openai.com/v1":
             # OpenAI-compatible APIs (包括自建服务器)
@@ -170,9 +220,31 @@ class TradingAgentsGraph:
                 print(f"🔗 Custom API Endpoint: {base_url}")
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
-        """Create tool nodes for different data sources."""
+        """Create tool nodes for different data sources.
+
+        The tool calls of one message run concurrently on at most
+        tool_max_workers threads. With tool_process_workers above 0 the
+        CPU-bound indicator tools run in a shared pool of worker processes,
+        which is shut down by close().
+        """
+        max_workers = self.config["tool_max_workers"]
+        self.tool_process_pool = None
+        indicator_tools = []
+        if self.config["tool_process_workers"] > 0:
+            # workers are started from tool threads, forking there would copy
+            # a multithreaded process
+            self.tool_process_pool = ProcessPoolExecutor(
+                max_workers=self.config["tool_process_workers"],
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            weakref.finalize(self, self.tool_process_pool.shutdown, wait=False)
+            indicator_tools = [
+                self.toolkit.get_stockstats_indicators_report.name,
+                self.toolkit.get_stockstats_indicators_report_online.name,
+            ]
+
         return {
-            "market": ToolNode(
+            "market": ConcurrentToolNode(
                 [
                     # online tools
                     self.toolkit.get_YFin_data_online,
@@ -180,17 +252,21 @@ class TradingAgentsGraph:
                     # offline tools
                     self.toolkit.get_YFin_data,
                     self.toolkit.get_stockstats_indicators_report,
-                ]
+                ],
+                max_workers=max_workers,
+                process_tools=indicator_tools,
+                process_pool=self.tool_process_pool,
             ),
-            "social": ToolNode(
+            "social": ConcurrentToolNode(
                 [
                     # online tools
                     self.toolkit.get_stock_news_openai,
                     # offline tools
                     self.toolkit.get_reddit_stock_info,
-                ]
+                ],
+                max_workers=max_workers,
             ),
-            "news": ToolNode(
+            "news": ConcurrentToolNode(
                 [
                     # online tools
                     self.toolkit.get_global_news_openai,
@@ -198,9 +274,10 @@ class TradingAgentsGraph:
                     # offline tools
                     self.toolkit.get_finnhub_news,
                     self.toolkit.get_reddit_news,
-                ]
+                ],
+                max_workers=max_workers,
             ),
-            "fundamentals": ToolNode(
+            "fundamentals": ConcurrentToolNode(
                 [
                     # online tools
                     self.toolkit.get_fundamentals_openai,
@@ -210,47 +287,113 @@ class TradingAgentsGraph:
                     self.toolkit.get_simfin_balance_sheet,
                     self.toolkit.get_simfin_cashflow,
                     self.toolkit.get_simfin_income_stmt,
-                ]
+                ],
+                max_workers=max_workers,
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def close(self):
+        """Release the worker processes of the tool nodes."""
+        if self.tool_process_pool is not None:
+            self.tool_process_pool.shutdown(wait=True, cancel_futures=True)
+            self.tool_process_pool = None
 
-        self.ticker = company_name
+    def __enter__(self):
+        return self
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        args = self.propagator.get_graph_args()
+    def __exit__(self, *exc_info):
+        self.close()
 
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+    def get_tool_timings(self) -> Dict[str, Dict[str, List[float]]]:
+        """Wall time of every tool call so far, by tool node and tool name."""
+        return {
+            node_name: {name: list(times) for name, times in node.timings.items()}
+            for node_name, node in self.tool_nodes.items()
+        }
 
-        # Store current state for reflection
-        self.curr_state = final_state
+    def propagate(self, company_name, trade_date):
+        """Run the trading agents graph for a company on a specific date."""
+        with use_config(self.config):
+            self.ticker = company_name
 
-        # Log state
-        self._log_state(trade_date, final_state)
+            # Initialize state
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+            args = self.propagator.get_graph_args()
+
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                for chunk in self.graph.stream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = self.graph.invoke(init_agent_state, **args)
+
+            # Store current state for reflection
+            self.curr_state = final_state
+
+            # Log state
+            self._log_state(trade_date, final_state)
+
+            # Return decision and processed signal
+            return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    async def apropagate(self, company_name, trade_date):
+        """Run the trading agents graph for a company on a specific date, asynchronously.
+
+        Analysts call their LLMs and tools asynchronously and the remaining
+        agents run in the event loop's executor, so one loop can drive many
+        analyses at once with the same graph.
+        """
+        with use_config(self.config):
+            self.ticker = company_name
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+            # Initialize state
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date
+            )
+            args = self.propagator.get_graph_args()
+
+            if self.debug:
+                # Debug mode with tracing
+                trace = []
+                async for chunk in self.graph.astream(init_agent_state, **args):
+                    if len(chunk["messages"]) == 0:
+                        pass
+                    else:
+                        chunk["messages"][-1].pretty_print()
+                        trace.append(chunk)
+
+                final_state = trace[-1]
+            else:
+                # Standard mode without tracing
+                final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+            # Store current state for reflection
+            self.curr_state = final_state
+
+            # Log state
+            await asyncio.to_thread(self._log_state, trade_date, final_state)
+
+            # Return decision and processed signal
+            return final_state, await self.signal_processor.aprocess_signal(
+                final_state["final_trade_decision"]
+            )
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
+        with self._log_lock:
+            self._write_state_log(trade_date, final_state)
+
+    def _write_state_log(self, trade_date, final_state):
         self.log_states_dict[str(trade_date)] = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
@@ -282,11 +425,12 @@ class TradingAgentsGraph:
         }
 
         # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
+        ticker = final_state["company_of_interest"]
+        directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
         directory.mkdir(parents=True, exist_ok=True)
 
         with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+            f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
             "w",
         ) as f:
             json.dump(self.log_states_dict, f, indent=4)